@@ -5,11 +5,15 @@ Demonstrates explicit states and transitions for predictable agent behavior.
 This is the foundational pattern - understand this before moving to frameworks.
 """
 
+import logging
+import time
 from enum import Enum
 from typing import Optional, Callable
 from dataclasses import dataclass
 from datetime import datetime
 
+log = logging.getLogger(__name__)
+
 
 class State(Enum):
     """Explicit states for document processing workflow."""
@@ -21,7 +25,12 @@ class State(Enum):
     RETRY = "retry"
 
 
-@dataclass
+# State values hoisted once, so logging doesn't go through the Enum
+# descriptor for .value on every transition
+_STATE_NAMES: dict[State, str] = {state: state.value for state in State}
+
+
+@dataclass(slots=True)
 class WorkflowContext:
     """Context passed through the workflow."""
     document_id: str
@@ -40,26 +49,32 @@ class StateMachine:
     - States are explicit (no hidden states)
     - Transitions are defined (no unexpected jumps)
     - Every transition is logged (auditability)
+
+    History timestamps are time.monotonic_ns() ints - cheap to take and
+    immune to clock jumps. Use history_as_datetimes() to export them.
     """
 
-    # Define valid transitions: current_state -> [allowed_next_states]
+    # Define valid transitions: current_state -> {allowed_next_states}
+    # (frozensets, so the membership check is a hash lookup, not a list scan)
     TRANSITIONS = {
-        State.RECEIVED: [State.PROCESSING],
-        State.PROCESSING: [State.VALIDATED, State.FAILED],
-        State.VALIDATED: [State.COMPLETED, State.FAILED],
-        State.FAILED: [State.RETRY],
-        State.RETRY: [State.PROCESSING],
-        State.COMPLETED: [],  # Terminal state
+        State.RECEIVED: frozenset({State.PROCESSING}),
+        State.PROCESSING: frozenset({State.VALIDATED, State.FAILED}),
+        State.VALIDATED: frozenset({State.COMPLETED, State.FAILED}),
+        State.FAILED: frozenset({State.RETRY}),
+        State.RETRY: frozenset({State.PROCESSING}),
+        State.COMPLETED: frozenset(),  # Terminal state
     }
 
     def __init__(self, context: WorkflowContext):
         self.context = context
         self.state = State.RECEIVED
-        self.history: list[tuple[datetime, State, State]] = []
+        self.history: list[tuple[int, State, State]] = []
+        # Anchor pairing wall-clock and monotonic time, for exporting history
+        self._clock_anchor = (time.time_ns(), time.monotonic_ns())
 
     def can_transition(self, to_state: State) -> bool:
         """Check if transition is valid."""
-        return to_state in self.TRANSITIONS.get(self.state, [])
+        return to_state in self.TRANSITIONS.get(self.state, ())
 
     def transition(self, to_state: State) -> bool:
         """
@@ -68,18 +83,28 @@ class StateMachine:
         Returns True if successful, False if invalid transition.
         """
         if not self.can_transition(to_state):
-            print(f"Invalid transition: {self.state.value} -> {to_state.value}")
+            log.warning("Invalid transition: %s -> %s",
+                        _STATE_NAMES[self.state], _STATE_NAMES[to_state])
             return False
 
         # Log the transition (audit trail)
-        self.history.append((datetime.now(), self.state, to_state))
+        self.history.append((time.monotonic_ns(), self.state, to_state))
 
         from_state = self.state
         self.state = to_state
-        print(f"Transition: {from_state.value} -> {to_state.value}")
+        log.debug("Transition: %s -> %s",
+                  _STATE_NAMES[from_state], _STATE_NAMES[to_state])
 
         return True
 
+    def history_as_datetimes(self) -> list[tuple[datetime, State, State]]:
+        """Export history with wall-clock datetimes instead of monotonic ns."""
+        wall_ns, mono_ns = self._clock_anchor
+        return [
+            (datetime.fromtimestamp((wall_ns + ts - mono_ns) / 1e9), from_s, to_s)
+            for ts, from_s, to_s in self.history
+        ]
+
     def is_terminal(self) -> bool:
         """Check if we've reached a terminal state."""
         return self.state == State.COMPLETED or (
@@ -101,6 +126,51 @@ def validate_document(content: str) -> bool:
     return len(content) > 10
 
 
+# One handler per state. Each performs that state's step on the context
+# and returns the state to move to, or None to stop the workflow early.
+# run_workflow and run_workflow_batch both drive the FSM through them.
+
+def _handle_received(context: WorkflowContext) -> Optional[State]:
+    return State.PROCESSING
+
+
+def _handle_processing(context: WorkflowContext) -> Optional[State]:
+    success, error = process_document(context.content)
+    if success:
+        context.validation_result = validate_document(context.content)
+        return State.VALIDATED
+    context.error_message = error
+    return State.FAILED
+
+
+def _handle_validated(context: WorkflowContext) -> Optional[State]:
+    if context.validation_result:
+        return State.COMPLETED
+    context.error_message = "Validation failed"
+    return State.FAILED
+
+
+def _handle_failed(context: WorkflowContext) -> Optional[State]:
+    if context.retry_count < context.max_retries:
+        context.retry_count += 1
+        return State.RETRY
+    return None
+
+
+def _handle_retry(context: WorkflowContext) -> Optional[State]:
+    return State.PROCESSING
+
+
+# State -> handler: one dict lookup per step instead of an if/elif chain
+_DISPATCH: dict[State, Callable[[WorkflowContext], Optional[State]]] = {
+    State.RECEIVED: _handle_received,
+    State.PROCESSING: _handle_processing,
+    State.VALIDATED: _handle_validated,
+    State.FAILED: _handle_failed,
+    State.RETRY: _handle_retry,
+}
+
+
 def run_workflow(document_id: str, content: str) -> str:
     """
     Run the document processing workflow.
@@ -118,37 +188,13 @@ def run_workflow(document_id: str, content: str) -> str:
     print(f"Initial state: {fsm.state.value}")
 
     while not fsm.is_terminal():
-
-        if fsm.state == State.RECEIVED:
-            fsm.transition(State.PROCESSING)
-
-        elif fsm.state == State.PROCESSING:
-            success, error = process_document(context.content)
-            if success:
-                context.validation_result = validate_document(context.content)
-                fsm.transition(State.VALIDATED)
-            else:
-                context.error_message = error
-                fsm.transition(State.FAILED)
-
-        elif fsm.state == State.VALIDATED:
-            if context.validation_result:
-                fsm.transition(State.COMPLETED)
-            else:
-                context.error_message = "Validation failed"
-                fsm.transition(State.FAILED)
-
-        elif fsm.state == State.FAILED:
-            if context.retry_count < context.max_retries:
-                context.retry_count += 1
-                print(f"Retry attempt {context.retry_count}/{context.max_retries}")
-                fsm.transition(State.RETRY)
-            else:
-                print("Max retries exceeded")
-                break
-
-        elif fsm.state == State.RETRY:
-            fsm.transition(State.PROCESSING)
+        next_state = _DISPATCH[fsm.state](context)
+        if next_state is None:
+            print("Max retries exceeded")
+            break
+        if next_state is State.RETRY:
+            print(f"Retry attempt {context.retry_count}/{context.max_retries}")
+        fsm.transition(next_state)
 
     print(f"\nFinal state: {fsm.state.value}")
     print(f"Transitions: {len(fsm.history)}")
@@ -156,7 +202,52 @@ def run_workflow(document_id: str, content: str) -> str:
     return fsm.state.value
 
 
+# State -> (handler, allowed next states) for batch replay, derived from
+# _DISPATCH and TRANSITIONS. Enum members hash in Python code, so one
+# lookup per step beats three, and membership in a small tuple is
+# checked by identity without hashing at all.
+_BATCH_STEPS: dict[State, tuple[Callable[[WorkflowContext], Optional[State]],
+                                tuple[State, ...]]] = {
+    state: (handler, tuple(StateMachine.TRANSITIONS[state]))
+    for state, handler in _DISPATCH.items()
+}
+
+
+def run_workflow_batch(contents: list[str], max_retries: int = 3) -> list[str]:
+    """
+    Replay the workflow for many documents at once.
+
+    Same handlers and transitions as run_workflow, but with no printing,
+    no logging and no timestamps - when replaying thousands of workflows,
+    that per-transition overhead is what dominates, not the workflow logic.
+
+    Returns the final state value for each document.
+    """
+    results = []
+    for content in contents:
+        context = WorkflowContext(document_id="", content=content,
+                                  max_retries=max_retries)
+        state = State.RECEIVED
+        while state is not State.COMPLETED:
+            handler, allowed = _BATCH_STEPS[state]
+            next_state = handler(context)
+            if next_state is None:
+                break
+            if next_state not in allowed:
+                raise ValueError(
+                    f"Invalid transition: {_STATE_NAMES[state]} -> "
+                    f"{_STATE_NAMES[next_state]}"
+                )
+            state = next_state
+
+        results.append(_STATE_NAMES[state])
+    return results
+
+
 if __name__ == "__main__":
+    # Show the transition log on the console
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+
     # Example 1: Successful workflow
     print("=" * 50)
     print("Example 1: Successful document")
@@ -171,3 +262,15 @@ if __name__ == "__main__":
     print("\n" + "=" * 50)
     print("Example 3: Too short (validation fails)")
     result = run_workflow("doc-003", "short")
+
+    # Example 4: Batch replay (no per-transition logging)
+    print("\n" + "=" * 50)
+    print("Example 4: Batch replay of 1,000 documents")
+    documents = [
+        "This is a valid document with enough content.",
+        "error",
+        "short",
+    ] * 333 + ["Another valid document, long enough."]
+    results = run_workflow_batch(documents)
+    for outcome in sorted(set(results)):
+        print(f"  {outcome}: {results.count(outcome)}")
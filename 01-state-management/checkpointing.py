@@ -6,14 +6,32 @@ If your agent crashes mid-workflow, resume from the last checkpoint - don't rest
 """
 
 import json
+import queue
 import sqlite3
+import threading
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, replace
+from itertools import groupby
 from typing import Optional
 from pathlib import Path
 
+# orjson is several times faster than stdlib json and emits bytes that go
+# straight into a BLOB column. Fall back to json if it isn't installed.
+try:
+    import orjson
 
-@dataclass
+    def _dumps(obj) -> bytes:
+        # Coerce int/float/bool keys to strings, as json.dumps does
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+    _loads = json.loads
+
+
+@dataclass(slots=True)
 class WorkflowState:
     """Serializable workflow state."""
     workflow_id: str
@@ -24,70 +42,190 @@ class WorkflowState:
     completed: bool = False
 
 
+@dataclass(slots=True)
+class CheckpointPatch:
+    """
+    Differential checkpoint: only what one step added to state.data.
+
+    Re-encoding the full data dict at every step writes O(N^2) bytes over
+    a workflow. A patch writes just the step's result; load() folds the
+    patches back onto the last full snapshot.
+    """
+    workflow_id: str
+    step_index: int
+    current_step: str
+    patch: dict
+    updated_at: str
+    completed: bool = False
+
+
+# Statements as module constants, so the connection's statement cache
+# reuses one compiled statement per query instead of re-parsing
+_SAVE_SQL = """
+    INSERT OR REPLACE INTO checkpoints
+    (workflow_id, current_step, data, created_at, updated_at, completed)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_SAVE_PATCH_SQL = """
+    INSERT OR REPLACE INTO checkpoint_diffs
+    (workflow_id, step_index, patch_json)
+    VALUES (?, ?, ?)
+"""
+_UPDATE_STEP_SQL = """
+    UPDATE checkpoints
+    SET current_step = ?, updated_at = ?, completed = ?
+    WHERE workflow_id = ?
+"""
+_DELETE_PATCHES_SQL = "DELETE FROM checkpoint_diffs WHERE workflow_id = ?"
+
+
 class CheckpointStore:
     """
     SQLite-based checkpoint store.
 
+    Holds one long-lived connection in WAL mode instead of reconnecting
+    on every call. Connection setup and the rollback-journal fsync were
+    the dominant cost of checkpointing after every step.
+
+    Each workflow has a full snapshot row in `checkpoints` plus zero or
+    more per-step rows in `checkpoint_diffs`. Saving a full snapshot
+    prunes the diffs it supersedes.
+
+    Durability tradeoff: under WAL, synchronous=NORMAL (the default here)
+    only fsyncs at WAL checkpoints, not on every commit. A power loss can
+    drop the last few commits, but the database stays consistent - and a
+    workflow that loses its latest checkpoint just replays that step.
+    Pass synchronous="FULL" if every commit must survive power loss.
+
     In production, you might use:
     - Redis for speed
     - PostgreSQL for durability
     - S3 for large states
     """
 
-    def __init__(self, db_path: str = "checkpoints.db"):
+    SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+    def __init__(self, db_path: str = "checkpoints.db",
+                 synchronous: str = "NORMAL"):
+        if synchronous.upper() not in self.SYNCHRONOUS_MODES:
+            raise ValueError(f"Unknown synchronous mode: {synchronous}")
         self.db_path = db_path
+        self.synchronous = synchronous.upper()
+        # Serializes transactions when a StorageWorker shares the connection
+        self._lock = threading.RLock()
         self._init_db()
 
     def _init_db(self):
-        """Initialize the checkpoint table."""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("""
+        """Open the connection, tune it, and initialize the checkpoint tables."""
+        # isolation_level=None: we manage transactions explicitly below
+        self.conn = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # Must come after WAL: NORMAL is only crash-safe in WAL mode
+        self.conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.execute("""
             CREATE TABLE IF NOT EXISTS checkpoints (
                 workflow_id TEXT PRIMARY KEY,
                 current_step TEXT,
-                data TEXT,
+                data BLOB,
                 created_at TEXT,
                 updated_at TEXT,
                 completed INTEGER DEFAULT 0
             )
         """)
-        conn.commit()
-        conn.close()
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoint_diffs (
+                workflow_id TEXT,
+                step_index INTEGER,
+                patch_json BLOB,
+                PRIMARY KEY (workflow_id, step_index)
+            )
+        """)
 
-    def save(self, state: WorkflowState):
-        """Save checkpoint."""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("""
-            INSERT OR REPLACE INTO checkpoints
-            (workflow_id, current_step, data, created_at, updated_at, completed)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
+    @contextmanager
+    def _transaction(self):
+        """Run the block in one write transaction (one commit, one fsync)."""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    @staticmethod
+    def _to_row(state: WorkflowState) -> tuple:
+        """Flatten a state into a checkpoints row."""
+        return (
             state.workflow_id,
             state.current_step,
-            json.dumps(state.data),
+            _dumps(state.data),
             state.created_at,
             state.updated_at,
             1 if state.completed else 0
-        ))
-        conn.commit()
-        conn.close()
-        print(f"  [Checkpoint] Saved at step: {state.current_step}")
+        )
+
+    def save(self, state: WorkflowState):
+        """Save checkpoint."""
+        self.save_many([state])
+
+    def save_many(self, checkpoints: list):
+        """
+        Save full snapshots and/or patches in a single transaction.
+
+        Entries are applied in order, so a snapshot correctly prunes the
+        patches queued before it.
+        """
+        if not checkpoints:
+            return
+        with self._transaction() as conn:
+            # One executemany per run of same-kind entries keeps the order
+            for is_patch, run in groupby(
+                checkpoints, key=lambda cp: isinstance(cp, CheckpointPatch)
+            ):
+                run = list(run)
+                if is_patch:
+                    conn.executemany(_SAVE_PATCH_SQL, [
+                        (cp.workflow_id, cp.step_index, _dumps(cp.patch))
+                        for cp in run
+                    ])
+                    conn.executemany(_UPDATE_STEP_SQL, [
+                        (cp.current_step, cp.updated_at,
+                         1 if cp.completed else 0, cp.workflow_id)
+                        for cp in run
+                    ])
+                else:
+                    conn.executemany(_SAVE_SQL, [self._to_row(cp) for cp in run])
+                    conn.executemany(_DELETE_PATCHES_SQL, [
+                        (cp.workflow_id,) for cp in run
+                    ])
+        for cp in checkpoints:
+            print(f"  [Checkpoint] Saved at step: {cp.current_step}")
 
     def load(self, workflow_id: str) -> Optional[WorkflowState]:
-        """Load checkpoint if exists."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.execute(
-            "SELECT * FROM checkpoints WHERE workflow_id = ?",
-            (workflow_id,)
-        )
-        row = cursor.fetchone()
-        conn.close()
+        """Load checkpoint if exists, replaying any patches onto the snapshot."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT * FROM checkpoints WHERE workflow_id = ?",
+                (workflow_id,)
+            ).fetchone()
+            patches = self.conn.execute(
+                "SELECT patch_json FROM checkpoint_diffs "
+                "WHERE workflow_id = ? ORDER BY step_index",
+                (workflow_id,)
+            ).fetchall()
 
         if row:
+            data = _loads(row[2])
+            for (patch_json,) in patches:
+                data.update(_loads(patch_json))
             return WorkflowState(
                 workflow_id=row[0],
                 current_step=row[1],
-                data=json.loads(row[2]),
+                data=data,
                 created_at=row[3],
                 updated_at=row[4],
                 completed=bool(row[5])
@@ -96,10 +234,106 @@ class CheckpointStore:
 
     def delete(self, workflow_id: str):
         """Delete checkpoint after successful completion."""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("DELETE FROM checkpoints WHERE workflow_id = ?", (workflow_id,))
-        conn.commit()
-        conn.close()
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM checkpoints WHERE workflow_id = ?", (workflow_id,)
+            )
+            conn.execute(_DELETE_PATCHES_SQL, (workflow_id,))
+
+    def close(self):
+        """Close the underlying connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "CheckpointStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class StorageWorker:
+    """
+    Background thread that persists checkpoints off the workflow's hot path.
+
+    advance() hands the snapshot to the worker and returns immediately, so
+    the fsync overlaps with the next step instead of blocking it. The worker
+    drains whatever has queued up and writes it in one transaction.
+
+    Call flush() before anything that must observe the writes (resuming,
+    deleting the checkpoint, tests).
+    """
+
+    _STOP = object()
+
+    def __init__(self, store: CheckpointStore):
+        self.store = store
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def start(self) -> "StorageWorker":
+        """Start the writer thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="checkpoint-writer", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def submit(self, checkpoint):
+        """Queue a snapshot or patch for writing. Returns immediately."""
+        self._queue.put(checkpoint)
+
+    def flush(self):
+        """Block until everything submitted so far has been written."""
+        if self._thread is None:
+            return  # not started, so nothing is being written
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self):
+        """Flush remaining checkpoints and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+        # Surface a failed write that no flush() has reported yet
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self):
+        while True:
+            # Block for one item, then drain whatever else is waiting
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            batch = [item for item in items
+                     if isinstance(item, (WorkflowState, CheckpointPatch))]
+            try:
+                self.store.save_many(batch)
+            except Exception as e:
+                self._error = e
+
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if any(item is self._STOP for item in items):
+                return
+
+    def __enter__(self) -> "StorageWorker":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
 
 class CheckpointedWorkflow:
@@ -111,14 +345,31 @@ class CheckpointedWorkflow:
     2. Resume from checkpoint if found
     3. Save checkpoint after each step
     4. Clean up checkpoint on completion
+
+    With batch_size > 1, checkpoints are buffered and written in one
+    transaction every batch_size steps (and on completion). Only do this
+    if your steps are idempotent - a crash replays the unflushed steps.
+
+    Pass a StorageWorker to write checkpoints in the background instead
+    of blocking advance() on the store.
+
+    advance() writes only the step's result as a patch; every
+    snapshot_every steps it writes a full snapshot to compact the patches.
     """
 
     STEPS = ["extract", "transform", "validate", "enrich", "complete"]
 
-    def __init__(self, workflow_id: str, store: CheckpointStore):
+    def __init__(self, workflow_id: str, store: CheckpointStore,
+                 batch_size: int = 1, worker: Optional[StorageWorker] = None,
+                 snapshot_every: int = 3):
         self.workflow_id = workflow_id
         self.store = store
+        self.batch_size = batch_size
+        self.worker = worker
+        self.snapshot_every = snapshot_every
         self.state: Optional[WorkflowState] = None
+        self._pending: list = []
+        self._patches_since_snapshot = 0
 
     def _get_step_index(self, step: str) -> int:
         """Get index of step in workflow."""
@@ -138,14 +389,16 @@ class CheckpointedWorkflow:
             self.state = existing
         else:
             print(f"Starting new workflow: {self.workflow_id}")
+            now = datetime.now().isoformat()
             self.state = WorkflowState(
                 workflow_id=self.workflow_id,
                 current_step=self.STEPS[0],
                 data=initial_data,
-                created_at=datetime.now().isoformat(),
-                updated_at=datetime.now().isoformat()
+                created_at=now,
+                updated_at=now
             )
-            self.store.save(self.state)
+            self._pending.append(self._snapshot())
+            self.flush()
 
         return self.state
 
@@ -167,8 +420,35 @@ class CheckpointedWorkflow:
         else:
             self.state.completed = True
 
-        # Checkpoint!
-        self.store.save(self.state)
+        # Checkpoint! Usually just the delta, periodically a full snapshot
+        self._patches_since_snapshot += 1
+        if self._patches_since_snapshot >= self.snapshot_every:
+            self._pending.append(self._snapshot())
+            self._patches_since_snapshot = 0
+        else:
+            self._pending.append(CheckpointPatch(
+                workflow_id=self.workflow_id,
+                step_index=current_index,
+                current_step=self.state.current_step,
+                patch=dict(step_result),
+                updated_at=self.state.updated_at,
+                completed=self.state.completed
+            ))
+        if len(self._pending) >= self.batch_size or self.state.completed:
+            self.flush()
+
+    def _snapshot(self) -> WorkflowState:
+        """Copy the state, since self.state keeps mutating after we queue it."""
+        return replace(self.state, data=dict(self.state.data))
+
+    def flush(self):
+        """Hand buffered checkpoints to the worker, or write them directly."""
+        if self.worker is not None:
+            for state in self._pending:
+                self.worker.submit(state)
+        else:
+            self.store.save_many(self._pending)
+        self._pending = []
 
     def is_complete(self) -> bool:
         """Check if workflow is complete."""
@@ -208,28 +488,31 @@ def run_workflow(workflow_id: str, data: dict, fail_at: Optional[str] = None):
     Try running with fail_at="validate", then run again without it.
     You'll see it resume from the checkpoint!
     """
-    store = CheckpointStore()
-    workflow = CheckpointedWorkflow(workflow_id, store)
-
-    # Start or resume
-    state = workflow.start_or_resume(data)
-
-    # Process remaining steps
-    while not workflow.is_complete():
-        try:
-            result = simulate_step(state.current_step, state.data, fail_at)
-            workflow.advance(result)
-        except RuntimeError as e:
-            print(f"\n  CRASH: {e}")
-            print("  State saved at checkpoint. Run again to resume.")
-            return
-
-    print(f"\nWorkflow completed!")
-    print(f"Final data: {json.dumps(state.data, indent=2)}")
-
-    # Clean up checkpoint
-    store.delete(workflow_id)
-    print("Checkpoint cleaned up.")
+    with CheckpointStore() as store, StorageWorker(store) as worker:
+        workflow = CheckpointedWorkflow(workflow_id, store, worker=worker)
+
+        # Start or resume
+        state = workflow.start_or_resume(data)
+
+        # Process remaining steps
+        while not workflow.is_complete():
+            try:
+                result = simulate_step(state.current_step, state.data, fail_at)
+                workflow.advance(result)
+            except RuntimeError as e:
+                print(f"\n  CRASH: {e}")
+                workflow.flush()
+                worker.flush()
+                print("  State saved at checkpoint. Run again to resume.")
+                return
+
+        print(f"\nWorkflow completed!")
+        print(f"Final data: {json.dumps(state.data, indent=2)}")
+
+        # Clean up checkpoint (after the worker's writes have landed)
+        worker.flush()
+        store.delete(workflow_id)
+        print("Checkpoint cleaned up.")
 
 
 if __name__ == "__main__":
@@ -7,6 +7,7 @@ This shows how the FSM concepts translate to a real framework.
 Requires: pip install langgraph langchain langchain-openai
 """
 
+from functools import lru_cache
 from typing import TypedDict, Literal
 from langgraph.graph import StateGraph, END
 
@@ -24,36 +25,40 @@ class AgentState(TypedDict):
 
 
 # Define node functions (each represents a state/action)
+#
+# Nodes return only the keys they change. LangGraph merges the partial
+# update into the state, so there's no need to copy the whole state
+# ({**state, ...}) in every node.
 
-def extract_node(state: AgentState) -> AgentState:
+def extract_node(state: AgentState) -> dict:
     """Extract information from document."""
     print("  [Extract] Processing document...")
 
     # Simulate extraction (in real code, call an LLM here)
     if "error" in state["document"].lower():
-        return {**state, "error": "Extraction failed"}
+        return {"error": "Extraction failed"}
 
     extracted = {
         "title": "Sample Document",
         "date": "2024-01-15",
         "amount": 1500.00
     }
-    return {**state, "extracted_data": extracted, "error": None}
+    return {"extracted_data": extracted, "error": None}
 
 
-def validate_node(state: AgentState) -> AgentState:
+def validate_node(state: AgentState) -> dict:
     """Validate extracted data."""
     print("  [Validate] Checking extracted data...")
 
     if state["extracted_data"] is None:
-        return {**state, "validation_result": False, "error": "No data to validate"}
+        return {"validation_result": False, "error": "No data to validate"}
 
     # Simulate validation
     is_valid = state["extracted_data"].get("amount", 0) > 0
-    return {**state, "validation_result": is_valid}
+    return {"validation_result": is_valid}
 
 
-def enrich_node(state: AgentState) -> AgentState:
+def enrich_node(state: AgentState) -> dict:
     """Enrich data with external information."""
     print("  [Enrich] Adding external data...")
 
@@ -63,20 +68,20 @@ def enrich_node(state: AgentState) -> AgentState:
         "priority": "normal",
         "processed_at": "2024-01-15T10:30:00Z"
     }
-    return {**state, "enriched_data": enriched}
+    return {"enriched_data": enriched}
 
 
-def complete_node(state: AgentState) -> AgentState:
+def complete_node(state: AgentState) -> dict:
     """Mark workflow as complete."""
     print("  [Complete] Finalizing...")
-    return {**state, "final_result": "success"}
+    return {"final_result": "success"}
 
 
-def error_node(state: AgentState) -> AgentState:
+def error_node(state: AgentState) -> dict:
     """Handle errors."""
     print(f"  [Error] Handling error: {state.get('error', 'Unknown')}")
     retry_count = state.get("retry_count", 0) + 1
-    return {**state, "retry_count": retry_count}
+    return {"retry_count": retry_count}
 
 
 # Define routing functions (determine transitions)
@@ -149,14 +154,24 @@ def build_workflow() -> StateGraph:
     return workflow
 
 
+@lru_cache(maxsize=1)
+def get_app():
+    """
+    Build and compile the workflow once, then reuse it.
+
+    Compiling validates edges and builds routing tables - there's no
+    reason to pay that for every document.
+    """
+    return build_workflow().compile()
+
+
 def run_example(document: str):
     """Run the workflow with a document."""
     print(f"\nProcessing: {document}")
     print("-" * 40)
 
-    # Build and compile the workflow
-    workflow = build_workflow()
-    app = workflow.compile()
+    # Reuse the compiled workflow
+    app = get_app()
 
     # Initial state
     initial_state: AgentState = {
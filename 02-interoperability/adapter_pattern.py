@@ -17,14 +17,27 @@ Key Principle: The legacy system thinks it's talking to a normal client.
 The agent thinks it's talking to a modern API.
 """
 
+import asyncio
 import json
 import time
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, Callable, List
+from typing import Dict, Any, Optional, Callable, List, NamedTuple, Deque
 from enum import Enum
 from abc import ABC, abstractmethod
+from collections import deque
 from functools import wraps
+import queue
 import random
+import sys
+import threading
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+# httpx is only needed to talk to a real SOAP endpoint
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 
 # =============================================================================
@@ -45,13 +58,16 @@ class CircuitState(Enum):
     HALF_OPEN = "half_open"
 
 
-@dataclass
+@dataclass(slots=True)
 class CircuitBreaker:
     """
     Circuit Breaker for resilient legacy system integration.
 
     Key Principle: Don't keep hammering a failing service.
     Fail fast and give it time to recover.
+
+    Timing uses time.monotonic(), so NTP or manual clock changes can't
+    open or close the circuit early.
     """
     failure_threshold: int = 5          # Failures before opening
     recovery_timeout: float = 30.0      # Seconds before trying again
@@ -59,27 +75,27 @@ class CircuitBreaker:
 
     state: CircuitState = CircuitState.CLOSED
     failure_count: int = 0
-    last_failure_time: float = 0
+    last_failure_time: float = 0        # time.monotonic() of last failure
     half_open_calls: int = 0
 
     def can_execute(self) -> bool:
         """Check if a request should be allowed."""
-        if self.state == CircuitState.CLOSED:
-            return True
+        return _CAN_EXECUTE[self.state](self)
 
-        if self.state == CircuitState.OPEN:
-            # Check if recovery timeout has passed
-            if time.time() - self.last_failure_time > self.recovery_timeout:
-                self.state = CircuitState.HALF_OPEN
-                self.half_open_calls = 0
-                return True
-            return False
-
-        if self.state == CircuitState.HALF_OPEN:
-            return self.half_open_calls < self.half_open_max_calls
+    def _can_execute_closed(self) -> bool:
+        return True
 
+    def _can_execute_open(self) -> bool:
+        # Check if recovery timeout has passed
+        if time.monotonic() - self.last_failure_time > self.recovery_timeout:
+            self.state = CircuitState.HALF_OPEN
+            self.half_open_calls = 0
+            return True
         return False
 
+    def _can_execute_half_open(self) -> bool:
+        return self.half_open_calls < self.half_open_max_calls
+
     def record_success(self) -> None:
         """Record a successful call."""
         if self.state == CircuitState.HALF_OPEN:
@@ -92,7 +108,7 @@ class CircuitBreaker:
     def record_failure(self) -> None:
         """Record a failed call."""
         self.failure_count += 1
-        self.last_failure_time = time.time()
+        self.last_failure_time = time.monotonic()
 
         if self.state == CircuitState.HALF_OPEN:
             # Failed during recovery test, reopen
@@ -102,6 +118,15 @@ class CircuitBreaker:
             self.state = CircuitState.OPEN
 
 
+# Table-driven dispatch for CircuitBreaker.can_execute: one lookup per call
+# instead of walking an if-chain over the states
+_CAN_EXECUTE = {
+    CircuitState.CLOSED: CircuitBreaker._can_execute_closed,
+    CircuitState.OPEN: CircuitBreaker._can_execute_open,
+    CircuitState.HALF_OPEN: CircuitBreaker._can_execute_half_open,
+}
+
+
 def with_retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
     """
     Retry decorator with exponential backoff.
@@ -129,6 +154,34 @@ def with_retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
     return decorator
 
 
+def with_retry_async(max_attempts: int = 3, delay: float = 1.0,
+                     backoff: float = 2.0):
+    """
+    Async retry decorator with exponential backoff.
+
+    Same policy as with_retry, but waits with asyncio.sleep, so a backoff
+    only pauses this call - other requests keep running on the event loop.
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            last_exception = None
+            current_delay = delay
+
+            for attempt in range(max_attempts):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    last_exception = e
+                    if attempt < max_attempts - 1:
+                        await asyncio.sleep(current_delay)
+                        current_delay *= backoff
+
+            raise last_exception
+        return wrapper
+    return decorator
+
+
 # =============================================================================
 # Legacy System Adapter Base Class
 # =============================================================================
@@ -208,11 +261,113 @@ class LegacySystemAdapter(ABC):
         """Call legacy system with automatic retry."""
         return self.call_legacy_system(legacy_request)
 
+    async def call_legacy_system_async(self, legacy_request: Any) -> Any:
+        """
+        Async version of call_legacy_system.
+
+        Defaults to running the blocking call in a worker thread. Adapters
+        with a native async client should override this.
+        """
+        return await asyncio.to_thread(self.call_legacy_system, legacy_request)
+
+    async def execute_async(self, agent_request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute a request through the adapter without blocking the event loop.
+
+        Same steps as execute(). Many concurrent legacy calls (and their
+        retry backoffs) overlap on one thread instead of queueing up.
+        """
+        if not self.circuit_breaker.can_execute():
+            return {
+                "error": "Service temporarily unavailable",
+                "details": "Circuit breaker is open - too many recent failures"
+            }
+
+        try:
+            legacy_request = self.translate_request(agent_request)
+            legacy_response = await self._call_with_retry_async(legacy_request)
+            result = self.translate_response(legacy_response)
+            self.circuit_breaker.record_success()
+            return result
+
+        except Exception as e:
+            self.circuit_breaker.record_failure()
+            return {
+                "error": "Legacy system call failed",
+                "details": str(e)
+            }
+
+    @with_retry_async(max_attempts=3, delay=0.5)
+    async def _call_with_retry_async(self, legacy_request: Any) -> Any:
+        """Call legacy system asynchronously with automatic retry."""
+        return await self.call_legacy_system_async(legacy_request)
+
 
 # =============================================================================
 # Example: SOAP to REST Adapter (ERP System)
 # =============================================================================
 
+# SOAP envelope template, built once. bytes + %-formatting skips format-spec
+# parsing, and the result is ready to send without a separate encode step.
+_SOAP_TEMPLATE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+  <soap:Body>
+    <%s xmlns="http://erp.example.com/inventory">
+      <sku>%s</sku>
+    </%s>
+  </soap:Body>
+</soap:Envelope>"""
+
+
+# Operations the ERP exposes. The action becomes the SOAP element name and
+# SOAPAction header, so anything else is rejected before it's sent.
+SOAP_ACTIONS = frozenset({"get_inventory"})
+
+# Keep-alive pool shared by all requests from one adapter
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32) if httpx else None
+_SOAP_HEADERS = {"Content-Type": "text/xml; charset=utf-8"}
+
+
+class _InternalRequest(NamedTuple):
+    """Structured ERP request passed between in-process adapter stages."""
+    action: str
+    sku: str
+
+
+def _to_soap_bytes(request: _InternalRequest) -> bytes:
+    """
+    Materialize the SOAP envelope for a request.
+
+    Only call this at the real legacy boundary. In-process stages pass
+    _InternalRequest around instead of building XML and parsing it back.
+    """
+    action = request.action.encode()
+    return _SOAP_TEMPLATE % (action, escape(request.sku).encode(), action)
+
+
+def _parse_soap_response(body: bytes) -> Dict[str, Any]:
+    """
+    Flatten the first element of a SOAP body into a dict.
+
+    <InventoryResponse><sku>SKU-001</sku><quantity>150</quantity>...
+    becomes {"sku": "SKU-001", "quantity": 150, ...}. A SOAP fault
+    becomes {"error": faultstring}.
+    """
+    envelope = ET.fromstring(body)
+    payload = next(iter(envelope.find(
+        "{http://schemas.xmlsoap.org/soap/envelope/}Body")), None)
+    if payload is None:
+        return {"error": "Empty SOAP response"}
+    if payload.tag.endswith("}Fault"):
+        return {"error": payload.findtext("faultstring", "SOAP fault")}
+
+    result: Dict[str, Any] = {}
+    for child in payload:
+        text = (child.text or "").strip()
+        result[child.tag.rpartition("}")[2]] = int(text) if text.isdigit() else text
+    return result
+
+
 class ERPSoapAdapter(LegacySystemAdapter):
     """
     Adapter for a legacy SOAP-based ERP system.
@@ -222,38 +377,42 @@ class ERPSoapAdapter(LegacySystemAdapter):
 
     What the legacy system sees: Normal SOAP client
     What the agent sees: Modern JSON API
+
+    Without an endpoint, the ERP is simulated in-process. With one, calls
+    go over HTTP through a pooled httpx client that is created once and
+    reused, so repeat calls skip the TCP/TLS handshake.
     """
 
-    def __init__(self):
+    def __init__(self, endpoint: Optional[str] = None):
         super().__init__("legacy-erp-soap")
 
+        if endpoint and httpx is None:
+            raise ImportError("ERPSoapAdapter with an endpoint needs httpx: "
+                              "pip install httpx")
+        self.endpoint = endpoint
+        self._client: Optional["httpx.Client"] = None
+        self._async_client: Optional["httpx.AsyncClient"] = None
+
         # Simulated legacy data
         self._inventory = {
             "SKU-001": {"name": "Widget Pro", "quantity": 150, "warehouse": "WH-A"},
             "SKU-002": {"name": "Gadget Plus", "quantity": 75, "warehouse": "WH-B"},
         }
 
-    def translate_request(self, agent_request: Dict[str, Any]) -> str:
+    def translate_request(self, agent_request: Dict[str, Any]) -> _InternalRequest:
         """
-        Convert JSON request to SOAP/XML envelope.
+        Convert JSON request to the ERP's request shape.
 
         Agent sends: {"action": "get_inventory", "sku": "SKU-001"}
         Legacy needs: <soap:Envelope>...</soap:Envelope>
-        """
-        action = agent_request.get("action")
-        sku = agent_request.get("sku", "")
 
-        # Build SOAP envelope (simplified)
-        soap_envelope = f"""<?xml version="1.0" encoding="UTF-8"?>
-<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
-  <soap:Body>
-    <{action} xmlns="http://erp.example.com/inventory">
-      <sku>{sku}</sku>
-    </{action}>
-  </soap:Body>
-</soap:Envelope>"""
-
-        return soap_envelope
+        The envelope itself is only built by _to_soap_bytes() when the
+        request actually goes over the wire.
+        """
+        return _InternalRequest(
+            action=agent_request.get("action", ""),
+            sku=agent_request.get("sku", "")
+        )
 
     def translate_response(self, legacy_response: str) -> Dict[str, Any]:
         """
@@ -261,44 +420,116 @@ class ERPSoapAdapter(LegacySystemAdapter):
 
         Legacy returns: <InventoryResponse>...</InventoryResponse>
         Agent receives: {"sku": "...", "quantity": 150, ...}
+
+        call_legacy_system already parses the SOAP body into a dict, so
+        there's nothing left to convert here.
         """
-        # In production, this would parse XML properly
-        # Simplified for demonstration
         return legacy_response
 
-    def call_legacy_system(self, legacy_request: str) -> Dict[str, Any]:
+    def call_legacy_system(self, legacy_request: _InternalRequest) -> Any:
         """
-        Simulate calling the legacy SOAP service.
+        Call the legacy SOAP service (simulated if there's no endpoint).
 
-        In production, this would use suds, zeep, or requests
-        to make actual SOAP calls.
+        A real endpoint's SOAP response is parsed into a dict.
         """
+        if legacy_request.action not in SOAP_ACTIONS:
+            return {"error": f"Unknown action: {legacy_request.action!r}"}
+        if self.endpoint:
+            if self._client is None:
+                self._client = httpx.Client(limits=_HTTP_LIMITS, timeout=10.0)
+            response = self._client.post(
+                self.endpoint,
+                content=_to_soap_bytes(legacy_request),
+                headers={**_SOAP_HEADERS, "SOAPAction": legacy_request.action}
+            )
+            response.raise_for_status()
+            return _parse_soap_response(response.content)
+
         # Simulate network delay
         time.sleep(0.1)
+        return self._lookup(legacy_request)
+
+    async def call_legacy_system_async(
+            self, legacy_request: _InternalRequest) -> Any:
+        """
+        Call the legacy SOAP service asynchronously.
 
+        Concurrent calls share one pooled httpx.AsyncClient on the event
+        loop instead of each opening its own connection.
+        """
+        if legacy_request.action not in SOAP_ACTIONS:
+            return {"error": f"Unknown action: {legacy_request.action!r}"}
+        if self.endpoint:
+            if self._async_client is None:
+                self._async_client = httpx.AsyncClient(
+                    limits=_HTTP_LIMITS, timeout=10.0
+                )
+            response = await self._async_client.post(
+                self.endpoint,
+                content=_to_soap_bytes(legacy_request),
+                headers={**_SOAP_HEADERS, "SOAPAction": legacy_request.action}
+            )
+            response.raise_for_status()
+            return _parse_soap_response(response.content)
+
+        # Simulate network delay without blocking the event loop
+        await asyncio.sleep(0.1)
+        return self._lookup(legacy_request)
+
+    def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Close the pooled async HTTP connections."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def _lookup(self, legacy_request: _InternalRequest) -> Dict[str, Any]:
+        """Simulated legacy-side handling of a SOAP request."""
         # Simulate occasional failures (10% chance)
         if random.random() < 0.1:
             raise ConnectionError("Legacy system timeout")
 
-        # Parse the "SOAP" request to extract SKU (simplified)
-        for sku, data in self._inventory.items():
-            if sku in legacy_request:
-                return {
-                    "sku": sku,
-                    "name": data["name"],
-                    "quantity": data["quantity"],
-                    "warehouse": data["warehouse"],
-                    "source": "legacy-erp"
-                }
+        # The SKU arrives structured - look it up directly
+        sku = legacy_request.sku
+        data = self._inventory.get(sku)
+        if data is None:
+            return {"error": "SKU not found"}
 
-        return {"error": "SKU not found"}
+        return {
+            "sku": sku,
+            "name": data["name"],
+            "quantity": data["quantity"],
+            "warehouse": data["warehouse"],
+            "source": "legacy-erp"
+        }
 
 
 # =============================================================================
 # Example: Safe Database Access Adapter
 # =============================================================================
 
-@dataclass
+# Closed vocabularies for commands and views. Values arriving from agent
+# requests are sys.intern()ed, so comparing them against these constants
+# hits str's identity fast path instead of a character-by-character compare.
+STATUS_PENDING = "pending"
+STATUS_VALIDATED = "validated"
+STATUS_EXECUTED = "executed"
+STATUS_REJECTED = "rejected"
+
+COMMAND_INSERT = "insert"
+COMMAND_UPDATE = "update"
+COMMAND_DELETE = "delete"
+
+VIEW_CUSTOMER_BASIC = "customer_basic"
+VIEW_CUSTOMER_FULL = "customer_full"
+
+
+@dataclass(slots=True)
 class DatabaseCommand:
     """
     Represents a database write command for the command queue.
@@ -312,7 +543,7 @@ class DatabaseCommand:
     table: str
     data: Dict[str, Any]
     submitted_by: str           # Agent ID
-    status: str = "pending"     # pending, validated, executed, rejected
+    status: str = STATUS_PENDING  # pending, validated, executed, rejected
     validation_errors: List[str] = field(default_factory=list)
 
 
@@ -330,26 +561,69 @@ class SafeDatabaseAdapter(LegacySystemAdapter):
     - Audit trail for all operations
 
     Key Principle: Read through views, write through queues.
+
+    Writes are buffered and handed to the validation process in batches
+    (max_batch_size commands or every flush_interval_s, whichever comes
+    first), so per-command validation/persistence overhead is paid once
+    per batch. on_batch is the hook for that process.
+
+    At most max_pending_commands writes can be buffered or awaiting
+    validation at once. Past that, new writes are rejected with an error
+    (and counted in dropped_total) until the validation process catches
+    up, so a stalled validator pushes back on agents instead of growing
+    memory without bound.
+
+    Decided (validated, executed or rejected) commands move to an audit
+    history of the last max_command_history decisions; see
+    get_command_history().
     """
 
-    def __init__(self):
+    def __init__(self, max_batch_size: int = 100, flush_interval_s: float = 1.0,
+                 on_batch: Optional[Callable[[List[DatabaseCommand]], None]] = None,
+                 max_pending_commands: int = 10_000,
+                 max_command_history: int = 10_000):
         super().__init__("safe-database")
 
-        # Simulated database tables
-        self._customers = {
-            "1": {"id": "1", "name": "Alice", "email": "alice@example.com",
-                  "ssn": "***-**-1234", "credit_score": 750},
-            "2": {"id": "2", "name": "Bob", "email": "bob@example.com",
-                  "ssn": "***-**-5678", "credit_score": 680},
+        # Simulated database table, stored column-wise: one list per column
+        # plus an id -> row-position index. Bulk view reads zip together
+        # just the allowed columns instead of filtering a dict per row.
+        customers = [
+            {"id": "1", "name": "Alice", "email": "alice@example.com",
+             "ssn": "***-**-1234", "credit_score": 750},
+            {"id": "2", "name": "Bob", "email": "bob@example.com",
+             "ssn": "***-**-5678", "credit_score": 680},
+        ]
+        self._columns: Dict[str, List[Any]] = {
+            column: [row.get(column) for row in customers]
+            for column in ("id", "name", "email", "ssn", "credit_score")
+        }
+        self._row_index: Dict[str, int] = {
+            row["id"]: position for position, row in enumerate(customers)
         }
 
-        # Command queue for writes
-        self._command_queue: List[DatabaseCommand] = []
+        self._next_cmd_id = 1
+        # Command queue for writes: commands still awaiting validation,
+        # keyed by command_id, so listing them is O(pending) rather than
+        # O(all commands ever)
+        self._pending: Dict[str, DatabaseCommand] = {}
+        self.max_pending_commands = max_pending_commands
+        self.dropped_total = 0
+        # Audit trail of decided commands, oldest first (bounded)
+        self._history: Deque[DatabaseCommand] = deque(maxlen=max_command_history)
+
+        # Write buffer in front of the command queue
+        self._max_batch_size = max_batch_size
+        self.flush_interval_s = flush_interval_s
+        self._on_batch = on_batch
+        self._buffer: List[DatabaseCommand] = []
+        self._buffer_lock = threading.Lock()
+        self._flush_thread: Optional[threading.Thread] = None
+        self._stop_flushing: Optional[threading.Event] = None
 
         # Secure view definitions (which columns agents can see)
         self._secure_views = {
-            "customer_basic": ["id", "name", "email"],  # No SSN or credit score
-            "customer_full": ["id", "name", "email", "credit_score"]  # Still no SSN
+            VIEW_CUSTOMER_BASIC: ["id", "name", "email"],  # No SSN or credit score
+            VIEW_CUSTOMER_FULL: ["id", "name", "email", "credit_score"]  # Still no SSN
         }
 
     def translate_request(self, agent_request: Dict[str, Any]) -> Dict[str, Any]:
@@ -365,7 +639,9 @@ class SafeDatabaseAdapter(LegacySystemAdapter):
         Handle database operations through safe patterns.
         """
         operation = request.get("operation")
-        view_name = request.get("view", "customer_basic")
+        view_name = request.get("view", VIEW_CUSTOMER_BASIC)
+        if isinstance(view_name, str):
+            view_name = sys.intern(view_name)
         customer_id = request.get("customer_id")
 
         if operation == "read":
@@ -383,25 +659,25 @@ class SafeDatabaseAdapter(LegacySystemAdapter):
         Key Principle: The view filters out columns the agent
         shouldn't see (like SSN).
         """
-        allowed_columns = self._secure_views.get(view_name)
+        allowed_columns = (self._secure_views.get(view_name)
+                           if isinstance(view_name, str) else None)
         if not allowed_columns:
             return {"error": f"View '{view_name}' not found"}
 
         if customer_id:
             # Single record
-            if customer_id not in self._customers:
+            position = self._row_index.get(customer_id)
+            if position is None:
                 return {"error": "Customer not found"}
 
-            customer = self._customers[customer_id]
-            # Filter to allowed columns only
-            filtered = {k: v for k, v in customer.items() if k in allowed_columns}
+            # Read only the allowed columns
+            filtered = {c: self._columns[c][position] for c in allowed_columns}
             return {"data": filtered, "view": view_name}
         else:
-            # All records (filtered)
-            results = []
-            for customer in self._customers.values():
-                filtered = {k: v for k, v in customer.items() if k in allowed_columns}
-                results.append(filtered)
+            # All records: zip the allowed columns into rows in one pass
+            selected = [self._columns[c] for c in allowed_columns]
+            results = [dict(zip(allowed_columns, values))
+                       for values in zip(*selected)]
             return {"data": results, "view": view_name}
 
     def _write_through_queue(self, request: Dict[str, Any]) -> Dict[str, Any]:
@@ -412,15 +688,32 @@ class SafeDatabaseAdapter(LegacySystemAdapter):
         not the write itself. A separate validated process
         reviews and executes (or rejects) the command.
         """
-        command = DatabaseCommand(
-            command_id=f"CMD-{len(self._command_queue) + 1:04d}",
-            command_type=request.get("command_type", "update"),
-            table=request.get("table", ""),
-            data=request.get("data", {}),
-            submitted_by=request.get("agent_id", "unknown")
-        )
-
-        self._command_queue.append(command)
+        command_type = request.get("command_type", COMMAND_UPDATE)
+        if not isinstance(command_type, str):
+            return {"error": f"Invalid command type: {command_type!r}"}
+        command_type = sys.intern(command_type)
+
+        with self._buffer_lock:
+            if len(self._pending) + len(self._buffer) >= self.max_pending_commands:
+                self.dropped_total += 1
+                return {"error": "Command queue is full, try again later"}
+            # Ids come from a counter, not the queue length, so they stay
+            # unique once commands are consumed from the queue
+            command = DatabaseCommand(
+                command_id=f"CMD-{self._next_cmd_id:04d}",
+                command_type=command_type,
+                table=request.get("table", ""),
+                data=request.get("data", {}),
+                submitted_by=request.get("agent_id", "unknown")
+            )
+            self._next_cmd_id += 1
+            self._buffer.append(command)
+            batch_full = len(self._buffer) >= self._max_batch_size
+            if not batch_full:
+                self._ensure_flusher()
+
+        if batch_full:
+            self.flush()
 
         return {
             "status": "submitted",
@@ -429,21 +722,115 @@ class SafeDatabaseAdapter(LegacySystemAdapter):
                        "A separate process will review and execute."
         }
 
+    @property
+    def max_batch_size(self) -> int:
+        """Largest batch handed to the validation process in one call."""
+        return self._max_batch_size
+
+    def flush(self) -> int:
+        """
+        Move all buffered commands to the command queue in one step.
+
+        Returns the number of commands flushed.
+        """
+        with self._buffer_lock:
+            batch, self._buffer = self._buffer, []
+            for command in batch:
+                self._pending[command.command_id] = command
+
+        if batch and self._on_batch:
+            self._on_batch(batch)
+        return len(batch)
+
+    def close(self) -> None:
+        """
+        Stop the background flusher and flush what's left.
+
+        A later write starts a fresh flusher, so the adapter stays usable.
+        """
+        with self._buffer_lock:
+            thread, self._flush_thread = self._flush_thread, None
+            if thread is not None:
+                self._stop_flushing.set()
+        if thread is not None:
+            thread.join()  # outside the lock: its last flush() needs it
+        self.flush()
+
+    def _ensure_flusher(self) -> None:
+        """
+        Start the time-based flush thread if it isn't running.
+
+        Caller must hold _buffer_lock, so concurrent writers can't both
+        start one. Each thread gets its own stop event, so one stopped by
+        close() can't be confused with its replacement.
+        """
+        if self._flush_thread is None:
+            self._stop_flushing = threading.Event()
+            self._flush_thread = threading.Thread(
+                target=self._flush_loop, args=(self._stop_flushing,),
+                name="command-flusher", daemon=True
+            )
+            self._flush_thread.start()
+
+    def _flush_loop(self, stop: threading.Event) -> None:
+        while not stop.wait(self.flush_interval_s):
+            self.flush()
+
     def get_pending_commands(self) -> List[Dict[str, Any]]:
         """Get all pending commands (for the validation process)."""
+        self.flush()
+        # The flush thread inserts into _pending under the same lock
+        with self._buffer_lock:
+            pending = list(self._pending.values())
         return [
-            {
-                "command_id": cmd.command_id,
-                "type": cmd.command_type,
-                "table": cmd.table,
-                "data": cmd.data,
-                "submitted_by": cmd.submitted_by,
-                "status": cmd.status
-            }
-            for cmd in self._command_queue
-            if cmd.status == "pending"
+            self._describe(cmd) for cmd in pending
+            if cmd.status == STATUS_PENDING
         ]
 
+    def get_command_history(self) -> List[Dict[str, Any]]:
+        """Get the most recently decided commands, oldest first (for audits)."""
+        with self._buffer_lock:
+            decided = list(self._history)
+        return [
+            {**self._describe(cmd), "validation_errors": list(cmd.validation_errors)}
+            for cmd in decided
+        ]
+
+    @staticmethod
+    def _describe(cmd: DatabaseCommand) -> Dict[str, Any]:
+        """Agent-facing view of a command."""
+        return {
+            "command_id": cmd.command_id,
+            "type": cmd.command_type,
+            "table": cmd.table,
+            "data": cmd.data,
+            "submitted_by": cmd.submitted_by,
+            "status": cmd.status
+        }
+
+    def set_command_status(self, command_id: str, status: str,
+                           errors: Optional[List[str]] = None) -> bool:
+        """
+        Record the validation process's decision on a command.
+
+        Returns False if the command is unknown or no longer pending.
+        """
+        self.flush()
+        with self._buffer_lock:
+            command = self._pending.pop(command_id, None)
+            if command is None:
+                return False
+            if isinstance(status, str):
+                status = sys.intern(status)
+            command.status = status
+            if errors:
+                command.validation_errors.extend(errors)
+            if status == STATUS_PENDING:
+                self._pending[command_id] = command
+            else:
+                self._history.append(command)
+        return True
+
 
 # =============================================================================
 # Example: Message Queue Adapter
@@ -458,37 +845,90 @@ class MessageQueueAdapter:
 
     Key Principle: A2A task completion can trigger a Kafka event.
     An incoming Kafka message can spawn a new agent task.
+
+    Queues are thread-safe and bounded (max_queue_size). When a queue is
+    full, overflow="block" pushes back on producers (waiting up to
+    publish_timeout, then rejecting), while overflow="drop_oldest" evicts
+    the oldest message, which suits best-effort notifications. Either way
+    the lost message is counted in dropped_total. Consumers can block in
+    consume_blocking() or register a wakeup callback rather than polling.
     """
 
-    def __init__(self):
+    OVERFLOW_POLICIES = ("block", "drop_oldest")
+
+    def __init__(self, max_queue_size: int = 10_000,
+                 publish_timeout: float = 1.0, overflow: str = "block"):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {self.OVERFLOW_POLICIES}")
         # Simulated message queues
-        self._queues: Dict[str, List[Dict[str, Any]]] = {
-            "orders": [],
-            "notifications": [],
-            "agent-tasks": []
+        self._queues: Dict[str, queue.Queue] = {
+            name: queue.Queue(maxsize=max_queue_size)
+            for name in ("orders", "notifications", "agent-tasks")
         }
+        self.publish_timeout = publish_timeout
+        self.overflow = overflow
+        self.dropped_total = 0
+        self._drop_lock = threading.Lock()
+        self.source = "agent-adapter"
+        self._wakeups: Dict[str, List[Callable[[str], None]]] = {}
+
+    def register_wakeup(self, queue_name: str,
+                        callback: Callable[[str], None]) -> None:
+        """
+        Call callback(queue_name) when the queue goes from empty to non-empty.
+
+        Lets an event-driven consumer react immediately instead of polling.
+        """
+        self._wakeups.setdefault(queue_name, []).append(callback)
 
     def publish(self, queue_name: str, message: Dict[str, Any]) -> Dict[str, Any]:
         """
         Publish a message to a queue.
 
         Use case: Agent completes a task and notifies downstream systems.
+        If the queue is full, either blocks up to publish_timeout
+        (backpressure) or drops the oldest message, per the overflow policy.
+
+        The queue takes ownership of message: it is enriched in place and
+        enqueued as-is rather than copied. Pass a copy if you need to keep
+        using the original.
         """
         if queue_name not in self._queues:
             return {"error": f"Queue '{queue_name}' not found"}
 
-        enriched_message = {
-            **message,
-            "timestamp": time.time(),
-            "source": "agent-adapter"
-        }
-
-        self._queues[queue_name].append(enriched_message)
+        message["timestamp"] = time.time()
+        message["source"] = self.source
+
+        q = self._queues[queue_name]
+        if self.overflow == "drop_oldest":
+            with self._drop_lock:
+                while True:
+                    try:
+                        q.put_nowait(message)
+                        break
+                    except queue.Full:
+                        try:
+                            q.get_nowait()
+                            self.dropped_total += 1
+                        except queue.Empty:
+                            pass
+        else:
+            try:
+                q.put(message, timeout=self.publish_timeout)
+            except queue.Full:
+                with self._drop_lock:
+                    self.dropped_total += 1
+                return {"error": f"Queue '{queue_name}' is full, try again later"}
+
+        message_count = q.qsize()
+        if message_count == 1:
+            for callback in self._wakeups.get(queue_name, ()):
+                callback(queue_name)
 
         return {
             "status": "published",
             "queue": queue_name,
-            "message_count": len(self._queues[queue_name])
+            "message_count": message_count
         }
 
     def consume(self, queue_name: str) -> Optional[Dict[str, Any]]:
@@ -500,10 +940,26 @@ class MessageQueueAdapter:
         if queue_name not in self._queues:
             return {"error": f"Queue '{queue_name}' not found"}
 
-        if self._queues[queue_name]:
-            return self._queues[queue_name].pop(0)
+        try:
+            return self._queues[queue_name].get_nowait()
+        except queue.Empty:
+            return None
 
-        return None
+    def consume_blocking(self, queue_name: str,
+                         timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next message on a queue.
+
+        The consumer sleeps until a message arrives (or timeout expires)
+        instead of spinning on consume(). Returns None on timeout.
+        """
+        if queue_name not in self._queues:
+            return {"error": f"Queue '{queue_name}' not found"}
+
+        try:
+            return self._queues[queue_name].get(timeout=timeout)
+        except queue.Empty:
+            return None
 
 
 # =============================================================================
@@ -527,6 +983,23 @@ if __name__ == "__main__":
     })
     print(f"Agent request (JSON): get_inventory for SKU-001")
     print(f"Agent receives (JSON): {result}")
+    envelope = _to_soap_bytes(erp_adapter.translate_request({
+        "action": "get_inventory", "sku": "SKU-001"
+    }))
+    print(f"Legacy system receives (SOAP): {len(envelope)}-byte XML envelope")
+
+    # Async: concurrent lookups overlap instead of running back to back
+    async def lookup_many():
+        return await asyncio.gather(*(
+            erp_adapter.execute_async({"action": "get_inventory", "sku": sku})
+            for sku in ["SKU-001", "SKU-002"] * 5
+        ))
+
+    start = time.perf_counter()
+    results = asyncio.run(lookup_many())
+    elapsed = time.perf_counter() - start
+    print(f"10 concurrent async lookups: {elapsed:.2f}s "
+          f"({sum('error' not in r for r in results)} succeeded)")
 
     # Example 2: Safe Database Access
     print("\n[2] Safe Database Adapter (Read through Views)")
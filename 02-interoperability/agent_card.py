@@ -13,11 +13,32 @@ Reference: "Making AI Agents Talk to Each Other" video - Chapter 2
 """
 
 import json
-from dataclasses import dataclass, field, asdict
-from typing import List, Optional, Dict, Any
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Tuple, ClassVar, FrozenSet, Set
 from enum import Enum
-from datetime import datetime
-import hashlib
+from datetime import datetime, timezone
+import secrets
+import time
+
+# orjson parses and serializes several times faster than stdlib json,
+# and encodes dataclasses such as AgentSkill natively in C.
+# Fall back to json if it isn't installed.
+try:
+    import orjson
+
+    def _dumps_indented(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    def _encode_default(obj: Any) -> Dict[str, Any]:
+        return obj._to_dict()
+
+    def _dumps_indented(obj: Any) -> str:
+        return json.dumps(obj, indent=2, default=_encode_default)
+
+    _loads = json.loads
 
 
 class TaskStatus(Enum):
@@ -38,7 +59,7 @@ class TaskStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentSkill:
     """
     Represents a single capability that an agent can perform.
@@ -58,8 +79,24 @@ class AgentSkill:
     tags: List[str] = field(default_factory=list)
     examples: List[Dict[str, Any]] = field(default_factory=list)
 
+    def _to_dict(self) -> Dict[str, Any]:
+        """Plain-dict view for JSON encoding (no deep copy, unlike asdict)."""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "input_schema": self.input_schema,
+            "output_schema": self.output_schema,
+            "tags": self.tags,
+            "examples": self.examples,
+        }
+
+
+def _trigrams(text: str) -> Set[str]:
+    """All 3-character substrings of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
 
-@dataclass
+@dataclass(slots=True)
 class AgentCard:
     """
     The Agent Card - a self-describing document for A2A-compliant agents.
@@ -85,31 +122,106 @@ class AgentCard:
     protocol_version: str               # A2A protocol version (e.g., "1.0")
 
     # Capabilities
-    skills: List[AgentSkill]            # What this agent can do
+    skills: Tuple[AgentSkill, ...]      # What this agent can do (stored as a tuple)
 
     # Optional metadata
     provider: str = ""                  # Organization providing this agent
     documentation_url: str = ""         # Link to detailed docs
     created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
 
+    # Derived lookup state (built by _reindex, not part of the card)
+    _by_name: Dict[str, AgentSkill] = field(
+        default=None, init=False, repr=False, compare=False)
+    _search_index: List[Tuple[AgentSkill, Tuple[str, ...]]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _trigram_index: Dict[str, Set[int]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _json_cache: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._reindex()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Any change to a public field invalidates the cached JSON
+        if not name.startswith("_"):
+            object.__setattr__(self, "_json_cache", None)
+        if name == "skills":
+            # A tuple can't be appended to behind the indexes' back
+            value = tuple(value)
+        object.__setattr__(self, name, value)
+        # Reassigning skills after __init__ rebuilds the lookup indexes
+        if name == "skills" and getattr(self, "_by_name", None) is not None:
+            self._reindex()
+
+    def _reindex(self) -> None:
+        """
+        Build lookup structures for skill discovery.
+
+        A name -> skill dict makes find_skill O(1), and pre-lowered search
+        text means matches_capability doesn't re-lowercase every skill on
+        every query. Runs whenever self.skills is assigned.
+        """
+        self._json_cache = None
+        self._by_name = {s.name: s for s in self.skills}
+        self._search_index = [
+            (s, (s.name.lower(), s.description.lower(),
+                 *(tag.lower() for tag in s.tags)))
+            for s in self.skills
+        ]
+        # Inverted index: trigram -> positions of skills whose text has it
+        self._trigram_index = defaultdict(set)
+        for position, (_, texts) in enumerate(self._search_index):
+            for text in texts:
+                for gram in _trigrams(text):
+                    self._trigram_index[gram].add(position)
+
+    def add_skill(self, skill: AgentSkill) -> None:
+        """Add a skill and refresh the lookup indexes."""
+        self.skills = (*self.skills, skill)
+
+    def _to_dict(self) -> Dict[str, Any]:
+        """
+        Plain-dict view for JSON encoding (no deep copy, unlike asdict).
+
+        Skills are left as AgentSkill objects for the encoder to handle.
+        """
+        return {
+            "agent_id": self.agent_id,
+            "name": self.name,
+            "description": self.description,
+            "service_endpoint": self.service_endpoint,
+            "protocol_version": self.protocol_version,
+            "skills": self.skills,
+            "provider": self.provider,
+            "documentation_url": self.documentation_url,
+            "created_at": self.created_at,
+        }
+
     def to_json(self) -> str:
-        """Serialize the Agent Card to JSON for publishing."""
-        return json.dumps(asdict(self), indent=2)
+        """
+        Serialize the Agent Card to JSON for publishing.
+
+        Cards are read far more often than they change, so the JSON is
+        cached until a field is reassigned or add_skill() is called.
+        Edits made inside an existing skill or schema are not tracked;
+        reassign card.skills afterwards to refresh the card.
+        """
+        if self._json_cache is None:
+            self._json_cache = _dumps_indented(self._to_dict())
+        return self._json_cache
 
     @classmethod
     def from_json(cls, json_str: str) -> "AgentCard":
         """Parse an Agent Card from JSON."""
-        data = json.loads(json_str)
+        data = _loads(json_str)
         # Convert skill dicts back to AgentSkill objects
         data["skills"] = [AgentSkill(**s) for s in data["skills"]]
         return cls(**data)
 
     def find_skill(self, skill_name: str) -> Optional[AgentSkill]:
         """Find a skill by name."""
-        for skill in self.skills:
-            if skill.name == skill_name:
-                return skill
-        return None
+        return self._by_name.get(skill_name)
 
     def matches_capability(self, query: str) -> List[AgentSkill]:
         """
@@ -119,17 +231,42 @@ class AgentCard:
         This simplified version uses keyword matching.
         """
         query_lower = query.lower()
+        query_grams = _trigrams(query_lower)
+
+        if query_grams:
+            # Only skills containing every trigram of the query can match
+            postings = sorted(
+                (self._trigram_index.get(gram, set()) for gram in query_grams),
+                key=len
+            )
+            candidates = sorted(set.intersection(*postings))
+        else:
+            # Query too short to have trigrams - check every skill
+            candidates = range(len(self._search_index))
+
+        # Confirm with the real substring check on name, description, and
+        # tags (pre-lowered in _reindex)
         matches = []
-        for skill in self.skills:
-            # Check name, description, and tags
-            if (query_lower in skill.name.lower() or
-                query_lower in skill.description.lower() or
-                any(query_lower in tag.lower() for tag in skill.tags)):
+        for position in candidates:
+            skill, texts = self._search_index[position]
+            if any(query_lower in text for text in texts):
                 matches.append(skill)
         return matches
 
 
-@dataclass
+def new_task_id() -> str:
+    """Mint a random task id (e.g. "task-9f86d081")."""
+    return f"task-{secrets.token_hex(4)}"
+
+
+def _iso_from_ns(timestamp_ns: int) -> str:
+    """Format a time.time_ns() value as a UTC ISO-8601 string."""
+    return datetime.fromtimestamp(
+        timestamp_ns / 1e9, timezone.utc
+    ).replace(tzinfo=None).isoformat()
+
+
+@dataclass(slots=True)
 class A2ATask:
     """
     Represents a task in the A2A protocol lifecycle.
@@ -138,6 +275,10 @@ class A2ATask:
     - Progress monitoring (polling, streaming, or webhooks)
     - Audit trails for compliance
     - Graceful error handling and retry logic
+
+    Timestamps are stored as integer nanoseconds (time.time_ns()) - cheap
+    enough to take on every transition. The created_at/updated_at
+    properties format them as ISO-8601 only when someone reads them.
     """
     task_id: str
     skill_name: str
@@ -145,8 +286,25 @@ class A2ATask:
     status: TaskStatus = TaskStatus.SUBMITTED
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_at_ns: int = field(default_factory=time.time_ns)
+    updated_at_ns: int = field(default_factory=time.time_ns)
+
+    # Valid transitions (simplified - production would have full FSM).
+    # Built once at class creation rather than on every transition_to call.
+    VALID_TRANSITIONS: ClassVar[Dict[TaskStatus, FrozenSet[TaskStatus]]] = {
+        TaskStatus.SUBMITTED: frozenset({TaskStatus.WORKING, TaskStatus.CANCELLED}),
+        TaskStatus.WORKING: frozenset({
+            TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED
+        }),
+    }
+
+    @property
+    def created_at(self) -> str:
+        return _iso_from_ns(self.created_at_ns)
+
+    @property
+    def updated_at(self) -> str:
+        return _iso_from_ns(self.updated_at_ns)
 
     def transition_to(self, new_status: TaskStatus,
                       result: Optional[Dict[str, Any]] = None,
@@ -157,20 +315,14 @@ class A2ATask:
         Key Principle: State transitions are explicit and logged,
         enabling debugging and audit trails.
         """
-        # Validate transition (simplified - production would have full FSM)
-        valid_transitions = {
-            TaskStatus.SUBMITTED: [TaskStatus.WORKING, TaskStatus.CANCELLED],
-            TaskStatus.WORKING: [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED],
-        }
-
-        if self.status in valid_transitions:
-            if new_status not in valid_transitions[self.status]:
-                raise ValueError(
-                    f"Invalid transition from {self.status.value} to {new_status.value}"
-                )
+        # Validate transition: one set lookup on the (from, to) pair
+        if (self.status, new_status) not in _ALLOWED_TRANSITIONS:
+            raise ValueError(
+                f"Invalid transition from {self.status.value} to {new_status.value}"
+            )
 
         self.status = new_status
-        self.updated_at = datetime.utcnow().isoformat()
+        self.updated_at_ns = time.time_ns()
 
         if result:
             self.result = result
@@ -178,10 +330,86 @@ class A2ATask:
             self.error = error
 
 
+# Every permitted (from, to) pair, flattened from VALID_TRANSITIONS.
+# States with no entry there (the terminal ones) aren't restricted.
+_ALLOWED_TRANSITIONS: FrozenSet[Tuple[TaskStatus, TaskStatus]] = frozenset(
+    (current, new)
+    for current in TaskStatus
+    for new in A2ATask.VALID_TRANSITIONS.get(current, TaskStatus)
+)
+
+
 # =============================================================================
 # Example: Compliance Agent Card
 # =============================================================================
 
+# Skill schemas and examples are built once at import and shared by every
+# card the factory creates. Treat them as read-only. (They stay plain dicts
+# rather than MappingProxyType so the JSON encoders can serialize them.)
+_CHECK_TRADE_INPUT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "trade_details": {
+            "type": "object",
+            "properties": {
+                "symbol": {"type": "string"},
+                "quantity": {"type": "number"},
+                "side": {"type": "string", "enum": ["buy", "sell"]},
+                "trader_id": {"type": "string"}
+            },
+            "required": ["symbol", "quantity", "side", "trader_id"]
+        }
+    },
+    "required": ["trade_details"]
+}
+
+_CHECK_TRADE_OUTPUT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "approved": {"type": "boolean"},
+        "compliance_report": {"type": "string"},
+        "risk_flags": {"type": "array", "items": {"type": "string"}}
+    }
+}
+
+_CHECK_TRADE_EXAMPLES: List[Dict[str, Any]] = [
+    {
+        "input": {
+            "trade_details": {
+                "symbol": "AAPL",
+                "quantity": 1000,
+                "side": "buy",
+                "trader_id": "trader-123"
+            }
+        },
+        "output": {
+            "approved": True,
+            "compliance_report": "Trade approved. No regulatory concerns identified.",
+            "risk_flags": []
+        }
+    }
+]
+
+_REPORT_INPUT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "start_date": {"type": "string", "format": "date"},
+        "end_date": {"type": "string", "format": "date"},
+        "report_type": {"type": "string", "enum": ["summary", "detailed"]}
+    },
+    "required": ["start_date", "end_date"]
+}
+
+_REPORT_OUTPUT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "report_id": {"type": "string"},
+        "report_url": {"type": "string"},
+        "summary": {"type": "string"}
+    }
+}
+
+
 def create_compliance_agent_card() -> AgentCard:
     """
     Create an Agent Card for a Regulatory Compliance Agent.
@@ -206,48 +434,10 @@ def create_compliance_agent_card() -> AgentCard:
                     "and firm-specific policies. Returns approval status with detailed "
                     "compliance report."
                 ),
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "trade_details": {
-                            "type": "object",
-                            "properties": {
-                                "symbol": {"type": "string"},
-                                "quantity": {"type": "number"},
-                                "side": {"type": "string", "enum": ["buy", "sell"]},
-                                "trader_id": {"type": "string"}
-                            },
-                            "required": ["symbol", "quantity", "side", "trader_id"]
-                        }
-                    },
-                    "required": ["trade_details"]
-                },
-                output_schema={
-                    "type": "object",
-                    "properties": {
-                        "approved": {"type": "boolean"},
-                        "compliance_report": {"type": "string"},
-                        "risk_flags": {"type": "array", "items": {"type": "string"}}
-                    }
-                },
+                input_schema=_CHECK_TRADE_INPUT_SCHEMA,
+                output_schema=_CHECK_TRADE_OUTPUT_SCHEMA,
                 tags=["compliance", "trading", "regulatory", "SEC"],
-                examples=[
-                    {
-                        "input": {
-                            "trade_details": {
-                                "symbol": "AAPL",
-                                "quantity": 1000,
-                                "side": "buy",
-                                "trader_id": "trader-123"
-                            }
-                        },
-                        "output": {
-                            "approved": True,
-                            "compliance_report": "Trade approved. No regulatory concerns identified.",
-                            "risk_flags": []
-                        }
-                    }
-                ]
+                examples=_CHECK_TRADE_EXAMPLES
             ),
             AgentSkill(
                 name="generate_compliance_report",
@@ -255,23 +445,8 @@ def create_compliance_agent_card() -> AgentCard:
                     "Generates a comprehensive compliance report for a given time period. "
                     "Includes all reviewed transactions, flagged items, and regulatory status."
                 ),
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "start_date": {"type": "string", "format": "date"},
-                        "end_date": {"type": "string", "format": "date"},
-                        "report_type": {"type": "string", "enum": ["summary", "detailed"]}
-                    },
-                    "required": ["start_date", "end_date"]
-                },
-                output_schema={
-                    "type": "object",
-                    "properties": {
-                        "report_id": {"type": "string"},
-                        "report_url": {"type": "string"},
-                        "summary": {"type": "string"}
-                    }
-                },
+                input_schema=_REPORT_INPUT_SCHEMA,
+                output_schema=_REPORT_OUTPUT_SCHEMA,
                 tags=["compliance", "reporting", "audit"]
             )
         ]
@@ -314,7 +489,7 @@ if __name__ == "__main__":
 
     # Create a task
     task = A2ATask(
-        task_id="task-" + hashlib.md5(b"example").hexdigest()[:8],
+        task_id=new_task_id(),
         skill_name="check_trade_compliance",
         input_data={
             "trade_details": {
@@ -20,11 +20,18 @@ Key Concept: MCP uses a Host-Client-Server topology:
 """
 
 import json
+import random
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Callable
 from enum import Enum
 from abc import ABC, abstractmethod
 
+# jsonschema is optional: without it, tool parameters aren't validated
+try:
+    from jsonschema import Draft202012Validator
+except ImportError:
+    Draft202012Validator = None
+
 
 class ToolCategory(Enum):
     """
@@ -52,7 +59,7 @@ class RiskLevel(Enum):
     HIGH = "high"       # Significant side effects, may be irreversible
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPTool:
     """
     Represents an MCP Tool - a function the LLM can invoke.
@@ -91,7 +98,7 @@ class MCPTool:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPResource:
     """
     Represents an MCP Resource - data the LLM can access.
@@ -116,6 +123,14 @@ class MCPResource:
     size_bytes: Optional[int] = None
 
 
+# Ticket-number generator (randrange is safe to share across threads)
+_ticket_rng = random.Random()
+
+
+# A tool implementation: takes the call's parameters, returns its result
+ToolHandler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
 class MCPServer(ABC):
     """
     Abstract base class for an MCP Server.
@@ -134,10 +149,39 @@ class MCPServer(ABC):
         self.server_name = server_name
         self._tools: Dict[str, MCPTool] = {}
         self._resources: Dict[str, MCPResource] = {}
+        self._validators: Dict[str, Any] = {}
+        self._handlers: Dict[str, ToolHandler] = {}
 
-    def register_tool(self, tool: MCPTool) -> None:
-        """Register a tool with this server."""
+    def register_tool(self, tool: MCPTool,
+                      handler: Optional[ToolHandler] = None) -> None:
+        """
+        Register a tool with this server.
+
+        handler(parameters) implements the tool; registering it alongside
+        the definition keeps dispatch and the tool list from drifting apart.
+
+        The tool's parameter schema is checked and compiled into a
+        validator here, once, rather than re-processed on every call.
+        """
         self._tools[tool.name] = tool
+        if handler is not None:
+            self._handlers[tool.name] = handler
+        if Draft202012Validator is not None:
+            Draft202012Validator.check_schema(tool.parameters)
+            self._validators[tool.name] = Draft202012Validator(tool.parameters)
+
+    def validate_parameters(self, tool_name: str,
+                            parameters: Dict[str, Any]) -> List[str]:
+        """
+        Validate parameters against the tool's precompiled schema.
+
+        Returns a list of error messages (empty if valid, or if jsonschema
+        isn't installed).
+        """
+        validator = self._validators.get(tool_name)
+        if validator is None:
+            return []
+        return [error.message for error in validator.iter_errors(parameters)]
 
     def register_resource(self, resource: MCPResource) -> None:
         """Register a resource with this server."""
@@ -195,6 +239,35 @@ class MCPServer(ABC):
 # Example: Customer Service MCP Server
 # =============================================================================
 
+# Policy documents served as resources. Immutable, so they're built once
+# and returned as-is on every read.
+_RETURN_POLICY_MD = """
+# Return Policy
+
+Items may be returned within 30 days of purchase for a full refund.
+- Items must be in original packaging
+- Electronics must be unopened
+- Sale items are final sale
+
+For returns, please contact customer service with your order number.
+"""
+
+_SHIPPING_INFO_MD = """
+# Shipping Information
+
+- Standard Shipping: 5-7 business days ($5.99)
+- Express Shipping: 2-3 business days ($12.99)
+- Overnight Shipping: Next business day ($24.99)
+
+Free shipping on orders over $50!
+"""
+
+_POLICY_DOCUMENTS = {
+    "policy://return-policy": _RETURN_POLICY_MD,
+    "policy://shipping-info": _SHIPPING_INFO_MD,
+}
+
+
 class CustomerServiceMCPServer(MCPServer):
     """
     Example MCP Server for a customer service agent.
@@ -235,6 +308,22 @@ class CustomerServiceMCPServer(MCPServer):
                 "total": 149.99
             }
         }
+        self._index_customers()
+
+    def _index_customers(self) -> None:
+        """
+        Build lookup indexes over the customer store.
+
+        Exact email and name-word lookups become dict reads instead of a
+        scan that re-lowercases every email on every search. Call again
+        after changing self._customers.
+        """
+        self._email_index: Dict[str, str] = {}
+        self._name_index: Dict[str, List[str]] = {}
+        for cust_id, data in self._customers.items():
+            self._email_index[data["email"].lower()] = cust_id
+            for word in data["name"].lower().split():
+                self._name_index.setdefault(word, []).append(cust_id)
 
     def _setup_tools(self) -> None:
         """Register the Golden Skills for customer service."""
@@ -276,7 +365,7 @@ class CustomerServiceMCPServer(MCPServer):
                     "output": {"customer_id": "CUST-001", "name": "Alice Johnson"}
                 }
             ]
-        ))
+        ), handler=lambda params: self._search_customer(params.get("query", "")))
 
         # Tool 2: Order status (low risk, read-only)
         self.register_tool(MCPTool(
@@ -310,7 +399,7 @@ class CustomerServiceMCPServer(MCPServer):
             category=ToolCategory.SEARCH,
             risk_level=RiskLevel.LOW,
             tags=["order", "status", "tracking"]
-        ))
+        ), handler=lambda params: self._get_order_status(params.get("order_id", "")))
 
         # Tool 3: Create support ticket (medium risk, creates data)
         self.register_tool(MCPTool(
@@ -349,7 +438,7 @@ class CustomerServiceMCPServer(MCPServer):
             category=ToolCategory.STORAGE,
             risk_level=RiskLevel.MEDIUM,
             tags=["support", "ticket", "escalation"]
-        ))
+        ), handler=self._create_ticket)
 
     def _setup_resources(self) -> None:
         """Register available data resources."""
@@ -385,15 +474,16 @@ class CustomerServiceMCPServer(MCPServer):
             # In production, this would trigger an approval workflow
             return {"error": "This tool requires human approval"}
 
-        # Execute based on tool name
-        if tool_name == "search_customer":
-            return self._search_customer(parameters.get("query", ""))
-        elif tool_name == "get_order_status":
-            return self._get_order_status(parameters.get("order_id", ""))
-        elif tool_name == "create_support_ticket":
-            return self._create_ticket(parameters)
-        else:
+        # Reject malformed parameters before they reach the implementation
+        errors = self.validate_parameters(tool_name, parameters)
+        if errors:
+            return {"error": "Invalid parameters", "details": errors}
+
+        # Dispatch to the handler registered with the tool
+        handler = self._handlers.get(tool_name)
+        if handler is None:
             return {"error": f"Tool '{tool_name}' not implemented"}
+        return handler(parameters)
 
     def read_resource(self, uri: str, user_context: Dict[str, Any]) -> str:
         """Read a resource with authorization checks."""
@@ -406,41 +496,38 @@ class CustomerServiceMCPServer(MCPServer):
         # Check authorization (simplified - production would check user_context)
         # Key Principle: Always verify scopes before returning data
 
-        if uri == "policy://return-policy":
-            return """
-# Return Policy
-
-Items may be returned within 30 days of purchase for a full refund.
-- Items must be in original packaging
-- Electronics must be unopened
-- Sale items are final sale
-
-For returns, please contact customer service with your order number.
-"""
-        elif uri == "policy://shipping-info":
-            return """
-# Shipping Information
-
-- Standard Shipping: 5-7 business days ($5.99)
-- Express Shipping: 2-3 business days ($12.99)
-- Overnight Shipping: Next business day ($24.99)
-
-Free shipping on orders over $50!
-"""
-        return ""
+        return _POLICY_DOCUMENTS.get(uri, "")
 
     def _search_customer(self, query: str) -> Dict[str, Any]:
-        """Search for a customer (internal implementation)."""
-        # Simplified - production would search database
-        for cust_id, data in self._customers.items():
-            if query in cust_id or query.lower() in data["email"].lower():
-                return {
-                    "customer_id": cust_id,
-                    "name": data["name"],
-                    "email": data["email"],
-                    "tier": data["tier"]
-                }
-        return {"error": "Customer not found"}
+        """
+        Search for a customer (internal implementation).
+
+        Exact ID, email and name-word matches are index lookups; only
+        partial IDs/emails fall back to scanning the store.
+        """
+        lowered = query.lower()
+        cust_id = (
+            (query if query in self._customers else None)
+            or self._email_index.get(lowered)
+            or next(iter(self._name_index.get(lowered, ())), None)
+        )
+        if cust_id is None:
+            # Simplified - production would search database
+            cust_id = next(
+                (cid for cid, data in self._customers.items()
+                 if query in cid or lowered in data["email"].lower()),
+                None
+            )
+        if cust_id is None:
+            return {"error": "Customer not found"}
+
+        data = self._customers[cust_id]
+        return {
+            "customer_id": cust_id,
+            "name": data["name"],
+            "email": data["email"],
+            "tier": data["tier"]
+        }
 
     def _get_order_status(self, order_id: str) -> Dict[str, Any]:
         """Get order status (internal implementation)."""
@@ -456,8 +543,7 @@ Free shipping on orders over $50!
 
     def _create_ticket(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Create a support ticket (internal implementation)."""
-        import random
-        ticket_id = f"TKT-{random.randint(10000, 99999)}"
+        ticket_id = f"TKT-{_ticket_rng.randrange(10000, 100000)}"
         return {
             "ticket_id": ticket_id,
             "status": "open",
@@ -17,11 +17,24 @@ Key Concept: Vector search provides BREADTH (find similar content).
 Graph traversal provides DEPTH (follow relationships). Together: comprehensive context.
 """
 
+import bisect
+import heapq
+import re
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Tuple
+from operator import attrgetter
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 from enum import Enum
 
+import numpy as np
+
+# hnswlib gives sub-linear approximate nearest-neighbor search for large
+# semantic stores. Without it, retrieve_semantic always does exact search.
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
 
 # =============================================================================
 # Three-Tier Memory Architecture
@@ -38,14 +51,16 @@ class MemoryTier(Enum):
     PROCEDURAL = "procedural"   # How-to knowledge (patterns, workflows)
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryItem:
     """A single item in the memory system."""
     item_id: str
     tier: MemoryTier
     content: str
     metadata: Dict[str, Any] = field(default_factory=dict)
-    embedding: List[float] = field(default_factory=list)
+    # float32; lists are converted on store. Left out of ==, which can't
+    # compare arrays elementwise to a single bool.
+    embedding: Optional[np.ndarray] = field(default=None, compare=False)
 
     # For episodic memories
     timestamp: Optional[datetime] = None
@@ -57,7 +72,7 @@ class MemoryItem:
     use_count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class RetrievalResult:
     """Result from any retrieval method."""
     item: MemoryItem
@@ -70,8 +85,26 @@ class RetrievalResult:
 # Reciprocal Rank Fusion
 # =============================================================================
 
+# Fused lists at least this long are scored with NumPy instead of a dict
+_RRF_NUMPY_MIN_RESULTS = 2048
+
+# k -> RRF weights 1/(k + rank) for ranks 1..len, grown on demand
+_RRF_WEIGHTS: Dict[int, np.ndarray] = {}
+
+
+def _rrf_weights(k: int, n: int) -> np.ndarray:
+    """The first n RRF weights for constant k, from a shared table."""
+    weights = _RRF_WEIGHTS.get(k)
+    if weights is None or len(weights) < n:
+        size = max(n, 1024)
+        weights = _RRF_WEIGHTS[k] = 1.0 / (k + np.arange(1, size + 1,
+                                                         dtype=np.float64))
+    return weights[:n]
+
+
 def reciprocal_rank_fusion(ranked_lists: List[List[RetrievalResult]],
-                           k: int = 60) -> List[RetrievalResult]:
+                           k: int = 60,
+                           limit: Optional[int] = None) -> List[RetrievalResult]:
     """
     Combine rankings from multiple retrieval sources using RRF.
 
@@ -86,40 +119,82 @@ def reciprocal_rank_fusion(ranked_lists: List[List[RetrievalResult]],
     Args:
         ranked_lists: List of ranked result lists from different sources
         k: Constant to prevent high scores for top ranks (default 60)
+        limit: Return only the top `limit` results (default: all)
 
     Returns:
         Fused ranking with combined scores
     """
-    # Track RRF scores by item_id
-    rrf_scores: Dict[str, float] = {}
-    item_map: Dict[str, MemoryItem] = {}
-
-    for results in ranked_lists:
-        for i, result in enumerate(results):
-            rank = i + 1  # 1-indexed
-            item_id = result.item.item_id
-
-            # RRF formula
-            rrf_contribution = 1.0 / (k + rank)
+    if sum(map(len, ranked_lists)) >= _RRF_NUMPY_MIN_RESULTS:
+        return _reciprocal_rank_fusion_numpy(ranked_lists, k, limit)
 
-            if item_id not in rrf_scores:
-                rrf_scores[item_id] = 0.0
-                item_map[item_id] = result.item
+    # RRF contribution for each (1-indexed) rank
+    longest = max(map(len, ranked_lists), default=0)
+    contributions = _rrf_weights(k, longest).tolist()
 
-            rrf_scores[item_id] += rrf_contribution
+    # item_id -> [rrf_score, item], so each result costs one dict lookup
+    fused: Dict[str, List[Any]] = {}
 
-    # Sort by RRF score
-    sorted_items = sorted(rrf_scores.items(), key=lambda x: x[1], reverse=True)
+    for results in ranked_lists:
+        for contribution, result in zip(contributions, results):
+            item = result.item
+            entry = fused.get(item.item_id)
+            if entry is None:
+                fused[item.item_id] = [contribution, item]
+            else:
+                entry[0] += contribution
+
+    # Sort by RRF score; for a top-k, a bounded heap avoids a full sort
+    if limit is None:
+        sorted_entries = sorted(fused.values(), key=lambda x: x[0], reverse=True)
+    else:
+        sorted_entries = heapq.nlargest(limit, fused.values(), key=lambda x: x[0])
 
     # Build final results
     return [
         RetrievalResult(
-            item=item_map[item_id],
+            item=item,
             score=score,
             source="hybrid_rrf",
             rank=i + 1
         )
-        for i, (item_id, score) in enumerate(sorted_items)
+        for i, (score, item) in enumerate(sorted_entries)
+    ]
+
+
+def _reciprocal_rank_fusion_numpy(ranked_lists: List[List[RetrievalResult]],
+                                  k: int,
+                                  limit: Optional[int]) -> List[RetrievalResult]:
+    """
+    RRF for long candidate lists: map item_ids to dense ints, then
+    scatter-add each list's 1/(k + rank) weights with np.bincount.
+
+    Ints are assigned in order of first appearance, so the stable sort
+    breaks ties the same way as the dict-based path.
+    """
+    ids: Dict[str, int] = {}
+    items: List[MemoryItem] = []
+    positions = []
+    for results in ranked_lists:
+        idx = []
+        for result in results:
+            item = result.item
+            pos = ids.setdefault(item.item_id, len(items))
+            if pos == len(items):
+                items.append(item)
+            idx.append(pos)
+        positions.append(np.array(idx, dtype=np.int64))
+
+    scores = np.zeros(len(items))
+    for idx in positions:
+        scores += np.bincount(idx, weights=_rrf_weights(k, len(idx)),
+                              minlength=len(items))
+
+    order = np.argsort(-scores, kind="stable")[:limit]
+    return [
+        RetrievalResult(item=items[pos], score=score,
+                        source="hybrid_rrf", rank=i + 1)
+        for i, (pos, score) in enumerate(zip(order.tolist(),
+                                             scores[order].tolist()))
     ]
 
 
@@ -127,6 +202,14 @@ def reciprocal_rank_fusion(ranked_lists: List[List[RetrievalResult]],
 # Hybrid Memory System
 # =============================================================================
 
+_timestamp = attrgetter("timestamp")
+
+
+def _procedural_rank(item: MemoryItem) -> Tuple[float, int]:
+    """Sort key putting the most successful, most used patterns first."""
+    return (-(item.success_rate or 0), -item.use_count)
+
+
 class HybridMemorySystem:
     """
     A hybrid memory system implementing the three-tier architecture.
@@ -138,34 +221,82 @@ class HybridMemorySystem:
 
     Key Principle: Different query types need different retrieval strategies.
     The hybrid system dynamically selects the best approach.
+
+    Once the semantic tier holds ann_min_items embeddings (and hnswlib is
+    installed), an HNSW approximate index is built over it and semantic
+    retrieval switches to it from exact search. Below that, exact search
+    is both fast and precise.
     """
 
-    def __init__(self):
+    def __init__(self, ann_min_items: int = 5000):
         # Simulated stores (in production, use real databases)
         self._memories: Dict[str, MemoryItem] = {}
         self._by_tier: Dict[MemoryTier, List[MemoryItem]] = {
             tier: [] for tier in MemoryTier
         }
+        # Timestamped episodic memories per user and per (user, session),
+        # kept sorted oldest -> newest as they are stored
         self._by_user: Dict[str, List[MemoryItem]] = {}
+        self._by_session: Dict[Tuple[str, str], List[MemoryItem]] = {}
+
+        # Simulated graph (entity relationships): entity -> memories
+        # that mention it, held by reference (memories are never deleted)
+        self._entity_to_memories: Dict[str, List[MemoryItem]] = {}
+
+        # Procedural memories per task_type, kept sorted best-first
+        self._procedural_by_task: Dict[str, List[MemoryItem]] = {}
+
+        # Semantic vector index: unit-normalized embeddings, one row per
+        # item in a preallocated float32 buffer that doubles when full
+        self._sem_items: List[MemoryItem] = []
+        self._sem_buffer: Optional[np.ndarray] = None
 
-        # Simulated graph (entity relationships)
-        self._entity_to_memories: Dict[str, List[str]] = {}
+        # Approximate index over the same items; labels are positions
+        # in self._sem_items
+        self.ann_min_items = ann_min_items
+        self._ann = None
 
     def store(self, item: MemoryItem) -> None:
         """Store a memory item."""
+        if item.embedding is not None:
+            item.embedding = np.ascontiguousarray(item.embedding, dtype=np.float32)
+
         self._memories[item.item_id] = item
         self._by_tier[item.tier].append(item)
 
-        if item.user_id:
-            if item.user_id not in self._by_user:
-                self._by_user[item.user_id] = []
-            self._by_user[item.user_id].append(item)
+        if (item.tier == MemoryTier.SEMANTIC and item.embedding is not None
+                and item.embedding.size):
+            self._sem_append(item.embedding)
+            self._sem_items.append(item)
+            # Build the HNSW index only once the tier is large enough
+            # to search through it, then keep it up to date
+            if self._ann is not None:
+                self._ann_add(item, len(self._sem_items) - 1)
+            elif (hnswlib is not None
+                    and len(self._sem_items) >= self.ann_min_items):
+                self._ann_build()
+
+        if item.user_id and item.timestamp:
+            # insort_left puts a memory before others with the same
+            # timestamp, so reading newest-first returns ties in the
+            # order they were stored
+            bisect.insort_left(self._by_user.setdefault(item.user_id, []),
+                               item, key=_timestamp)
+            if item.session_id:
+                bisect.insort_left(
+                    self._by_session.setdefault(
+                        (item.user_id, item.session_id), []),
+                    item, key=_timestamp)
+
+        if item.tier == MemoryTier.PROCEDURAL:
+            bisect.insort(
+                self._procedural_by_task.setdefault(
+                    item.metadata.get("task_type"), []),
+                item, key=_procedural_rank)
 
         # Index by mentioned entities (simplified)
         for entity in item.metadata.get("entities", []):
-            if entity not in self._entity_to_memories:
-                self._entity_to_memories[entity] = []
-            self._entity_to_memories[entity].append(item.item_id)
+            self._entity_to_memories.setdefault(entity, []).append(item)
 
     def retrieve_episodic(self, user_id: str, session_id: Optional[str] = None,
                           limit: int = 10) -> List[RetrievalResult]:
@@ -177,17 +308,13 @@ class HybridMemorySystem:
         Key Principle: Episodic memory provides personalized context
         based on the user's history.
         """
-        memories = self._by_user.get(user_id, [])
-
         if session_id:
-            memories = [m for m in memories if m.session_id == session_id]
+            memories = self._by_session.get((user_id, session_id), [])
+        else:
+            memories = self._by_user.get(user_id, [])
 
-        # Sort by timestamp (most recent first)
-        memories = sorted(
-            [m for m in memories if m.timestamp],
-            key=lambda x: x.timestamp,
-            reverse=True
-        )[:limit]
+        # Already sorted by timestamp: take the newest `limit`, newest first
+        memories = memories[-limit:][::-1] if limit > 0 else []
 
         return [
             RetrievalResult(item=m, score=1.0 / (i + 1), source="episodic", rank=i + 1)
@@ -201,27 +328,81 @@ class HybridMemorySystem:
 
         Used for: "Here's what the policy says about returns..."
 
-        This is the vector search component.
+        This is the vector search component: cosine similarity against
+        every semantic memory in one matrix-vector product.
         """
-        semantic_memories = self._by_tier[MemoryTier.SEMANTIC]
+        if not self._sem_items or limit <= 0:
+            return []
+
+        if self._ann is not None and len(self._sem_items) >= self.ann_min_items:
+            return self._retrieve_semantic_ann(query_embedding, limit)
 
-        # Simplified similarity (in production, use proper cosine similarity)
-        results = []
-        for memory in semantic_memories:
-            if memory.embedding:
-                # Mock similarity score
-                score = sum(a * b for a, b in zip(
-                    query_embedding[:10], memory.embedding[:10]
-                )) / 10
-                results.append((memory, abs(score)))
+        matrix = self._sem_buffer[:len(self._sem_items)]
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        scores = matrix @ query
 
-        results.sort(key=lambda x: x[1], reverse=True)
+        # Top-k without sorting everything: partition, then sort the k
+        if limit < len(scores):
+            top = np.argpartition(-scores, limit)[:limit]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
 
         return [
-            RetrievalResult(item=m, score=s, source="semantic_vector", rank=i + 1)
-            for i, (m, s) in enumerate(results[:limit])
+            RetrievalResult(item=self._sem_items[idx], score=float(scores[idx]),
+                            source="semantic_vector", rank=i + 1)
+            for i, idx in enumerate(top)
         ]
 
+    def _retrieve_semantic_ann(self, query_embedding: List[float],
+                               limit: int) -> List[RetrievalResult]:
+        """Approximate top-k semantic search through the HNSW index."""
+        k = min(limit, len(self._sem_items))
+        self._ann.set_ef(max(50, k))  # ef must be at least k
+        labels, distances = self._ann.knn_query(
+            np.asarray(query_embedding, dtype=np.float32), k=k
+        )
+        return [
+            RetrievalResult(item=self._sem_items[label],
+                            score=1.0 - float(distance),  # cosine distance
+                            source="semantic_vector", rank=i + 1)
+            for i, (label, distance) in enumerate(zip(labels[0], distances[0]))
+        ]
+
+    def _ann_build(self) -> None:
+        """Create the HNSW index from the semantic buffer in one bulk add."""
+        n = len(self._sem_items)
+        rows = self._sem_buffer[:n]
+        self._ann = hnswlib.Index(space="cosine", dim=rows.shape[1])
+        self._ann.init_index(max_elements=max(1024, 2 * n),
+                             ef_construction=200, M=16)
+        self._ann.add_items(rows, np.arange(n))
+
+    def _ann_add(self, item: MemoryItem, label: int) -> None:
+        """Add one embedding to the HNSW index, growing it as needed."""
+        if label >= self._ann.get_max_elements():
+            self._ann.resize_index(2 * self._ann.get_max_elements())
+        self._ann.add_items(item.embedding[None, :], [label])
+
+    def _sem_append(self, embedding: np.ndarray) -> None:
+        """Write a normalized embedding into the next free matrix row."""
+        row = len(self._sem_items)
+        if self._sem_buffer is None:
+            self._sem_buffer = np.empty((64, embedding.size), dtype=np.float32)
+        elif embedding.size != self._sem_buffer.shape[1]:
+            raise ValueError(f"Embedding has {embedding.size} dimensions, "
+                             f"expected {self._sem_buffer.shape[1]}")
+        elif row == len(self._sem_buffer):
+            grown = np.empty((2 * row, embedding.size), dtype=np.float32)
+            grown[:row] = self._sem_buffer
+            self._sem_buffer = grown
+
+        norm = np.linalg.norm(embedding)
+        self._sem_buffer[row] = embedding / norm if norm else embedding
+
     def retrieve_by_entity(self, entity: str, limit: int = 10) -> List[RetrievalResult]:
         """
         Retrieve memories related to a specific entity.
@@ -230,12 +411,38 @@ class HybridMemorySystem:
 
         This is the graph traversal component (simplified).
         """
-        memory_ids = self._entity_to_memories.get(entity, [])
-        memories = [self._memories[mid] for mid in memory_ids if mid in self._memories]
+        memories = self._entity_to_memories.get(entity, [])[:limit]
 
         return [
             RetrievalResult(item=m, score=1.0 / (i + 1), source="graph_entity", rank=i + 1)
-            for i, m in enumerate(memories[:limit])
+            for i, m in enumerate(memories)
+        ]
+
+    def retrieve_by_entities(self, entities: List[str],
+                             limit: int = 10) -> List[RetrievalResult]:
+        """
+        Retrieve memories related to any of several entities, as one list.
+
+        Memories linked to more of the entities rank higher (score is
+        the number of entities matched), so a memory tying several query
+        entities together isn't diluted across per-entity lists.
+        """
+        hits: Dict[str, List[Any]] = {}  # item_id -> [hit_count, item]
+        for entity in entities:
+            for memory in self._entity_to_memories.get(entity, ()):
+                entry = hits.get(memory.item_id)
+                if entry is None:
+                    hits[memory.item_id] = [1, memory]
+                else:
+                    entry[0] += 1
+
+        # nlargest matches a stable sort: ties keep first-seen order
+        ranked = heapq.nlargest(limit, hits.values(), key=lambda x: x[0])
+
+        return [
+            RetrievalResult(item=m, score=float(count), source="graph_entity",
+                            rank=i + 1)
+            for i, (count, m) in enumerate(ranked)
         ]
 
     def retrieve_procedural(self, task_type: str, limit: int = 5) -> List[RetrievalResult]:
@@ -247,25 +454,33 @@ class HybridMemorySystem:
         Key Principle: Don't reason from scratch. Retrieve and adapt
         proven patterns.
         """
-        procedural_memories = self._by_tier[MemoryTier.PROCEDURAL]
-
-        # Filter by task type and sort by success rate
-        relevant = [
-            m for m in procedural_memories
-            if m.metadata.get("task_type") == task_type
-        ]
-
-        # Sort by success rate (highest first)
-        relevant.sort(
-            key=lambda x: (x.success_rate or 0, x.use_count),
-            reverse=True
-        )
+        # Already sorted by success rate, then use count (highest first)
+        relevant = self._procedural_by_task.get(task_type, [])[:limit]
 
         return [
             RetrievalResult(item=m, score=m.success_rate or 0.5, source="procedural", rank=i + 1)
-            for i, m in enumerate(relevant[:limit])
+            for i, m in enumerate(relevant)
         ]
 
+    def update_procedural(self, item_id: str,
+                          success_rate: Optional[float] = None,
+                          use_count: Optional[int] = None) -> None:
+        """
+        Update a procedural memory's stats and restore its ranking.
+
+        Change success_rate/use_count through this method rather than
+        on the item directly, so retrieve_procedural stays correctly ordered.
+        """
+        item = self._memories[item_id]
+        ranked = self._procedural_by_task[item.metadata.get("task_type")]
+        del ranked[next(i for i, m in enumerate(ranked) if m is item)]
+
+        if success_rate is not None:
+            item.success_rate = success_rate
+        if use_count is not None:
+            item.use_count = use_count
+        bisect.insort(ranked, item, key=_procedural_rank)
+
     def hybrid_retrieve(self, query_embedding: List[float],
                         user_id: Optional[str] = None,
                         entities: Optional[List[str]] = None,
@@ -296,10 +511,9 @@ class HybridMemorySystem:
 
         # Graph (entity) retrieval
         if entities:
-            for entity in entities:
-                entity_results = self.retrieve_by_entity(entity, limit=limit)
-                if entity_results:
-                    ranked_lists.append(entity_results)
+            entity_results = self.retrieve_by_entities(entities, limit=limit)
+            if entity_results:
+                ranked_lists.append(entity_results)
 
         # Procedural (pattern) retrieval
         if task_type:
@@ -307,18 +521,29 @@ class HybridMemorySystem:
             if procedural_results:
                 ranked_lists.append(procedural_results)
 
-        # Fuse all results
+        # Fuse all results. A single list has nothing to fuse with: RRF
+        # would keep its order, so return it as-is.
         if not ranked_lists:
             return []
+        if len(ranked_lists) == 1:
+            return ranked_lists[0][:limit]
 
-        return reciprocal_rank_fusion(ranked_lists)[:limit]
+        return reciprocal_rank_fusion(ranked_lists, limit=limit)
 
 
 # =============================================================================
 # Hierarchical Retrieval
 # =============================================================================
 
-@dataclass
+_WORD_RE = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, with punctuation stripped."""
+    return _WORD_RE.findall(text.lower())
+
+
+@dataclass(slots=True)
 class HierarchicalIndex:
     """
     Hierarchical retrieval structure for efficient search.
@@ -334,6 +559,40 @@ class HierarchicalIndex:
     domains: Dict[str, List[str]] = field(default_factory=dict)  # domain -> doc_ids
     documents: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # doc_id -> metadata
     chunks: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)  # doc_id -> chunks
+    # Inverted index: token -> {doc_id -> positions of chunks containing it}
+    postings: Dict[str, Dict[str, List[int]]] = field(default_factory=dict)
+    # doc_id -> (chunk list the postings were built from, chunks indexed)
+    indexed_chunks: Dict[str, Tuple[List[Dict[str, Any]], int]] = field(
+        default_factory=dict)
+
+    def add_document(self, domain: str, doc_id: str, metadata: Dict[str, Any],
+                     chunks: List[Dict[str, Any]]) -> None:
+        """Add a document and tokenize its chunks once, at index time."""
+        self.domains.setdefault(domain, []).append(doc_id)
+        self.documents[doc_id] = metadata
+        self.chunks[doc_id] = chunks
+        self.index_chunks(doc_id)
+
+    def index_chunks(self, doc_id: str) -> None:
+        """
+        Add any of doc_id's chunks not yet in the postings.
+
+        Appending to chunks[doc_id] only indexes the new chunks. If the
+        list was replaced or shortened, the document's postings are
+        rebuilt from scratch. Edits to a chunk's content in place are
+        not detected.
+        """
+        chunks = self.chunks.get(doc_id, [])
+        indexed, count = self.indexed_chunks.get(doc_id, (chunks, 0))
+        if indexed is not chunks or count > len(chunks):
+            for docs in self.postings.values():
+                docs.pop(doc_id, None)
+            count = 0
+        for position in range(count, len(chunks)):
+            for token in set(_tokenize(chunks[position].get("content", ""))):
+                self.postings.setdefault(token, {}).setdefault(
+                    doc_id, []).append(position)
+        self.indexed_chunks[doc_id] = (chunks, len(chunks))
 
 
 def hierarchical_retrieve(index: HierarchicalIndex,
@@ -361,17 +620,32 @@ def hierarchical_retrieve(index: HierarchicalIndex,
         relevant_docs.extend(index.domains.get(domain, []))
 
     # Step 3: Chunk retrieval
+    # In production, use vector similarity. Here a chunk matches if it
+    # contains any query word, found by walking the postings of the query
+    # tokens rather than scanning chunk text.
+    tokens = set(_tokenize(query))
+    if not tokens:
+        return []
+
+    doc_set = set(relevant_docs)
+    for doc_id in doc_set:
+        index.index_chunks(doc_id)  # no-op unless chunks were changed directly
+
+    matched: Dict[str, Set[int]] = {}
+    for token in tokens:
+        for doc_id, positions in index.postings.get(token, {}).items():
+            if doc_id in doc_set:
+                matched.setdefault(doc_id, set()).update(positions)
+
     results = []
     for doc_id in relevant_docs:
         chunks = index.chunks.get(doc_id, [])
-        for chunk in chunks:
-            # In production, use vector similarity
-            if any(word in chunk.get("content", "").lower() for word in query.lower().split()):
-                results.append({
-                    "doc_id": doc_id,
-                    "doc_metadata": index.documents.get(doc_id, {}),
-                    "chunk": chunk
-                })
+        for position in sorted(matched.get(doc_id, ())):
+            results.append({
+                "doc_id": doc_id,
+                "doc_metadata": index.documents.get(doc_id, {}),
+                "chunk": chunks[position]
+            })
 
     return results
 
@@ -385,6 +659,10 @@ if __name__ == "__main__":
     print("Hybrid Retrieval Demonstration")
     print("=" * 70)
 
+    # Mock embeddings, built once and shared by the stores and the query
+    returns_embedding = np.array([0.1, 0.2, 0.3, 0.4, 0.5] * 10, dtype=np.float32)
+    shipping_embedding = np.array([0.2, 0.1, 0.4, 0.3, 0.6] * 10, dtype=np.float32)
+
     # Create hybrid memory system
     memory = HybridMemorySystem()
 
@@ -418,14 +696,14 @@ if __name__ == "__main__":
         item_id="sem-001",
         tier=MemoryTier.SEMANTIC,
         content="Return policy: Items may be returned within 30 days for full refund.",
-        embedding=[0.1, 0.2, 0.3, 0.4, 0.5] * 10,  # Mock embedding
+        embedding=returns_embedding,
         metadata={"entities": ["return-policy"], "source": "policy-manual"}
     ))
     memory.store(MemoryItem(
         item_id="sem-002",
         tier=MemoryTier.SEMANTIC,
         content="Shipping times: Standard 5-7 days, Express 2-3 days.",
-        embedding=[0.2, 0.1, 0.4, 0.3, 0.6] * 10,
+        embedding=shipping_embedding,
         metadata={"entities": ["shipping-info"], "source": "shipping-guide"}
     ))
     print("  Added 2 semantic memories (policy documents)")
@@ -452,7 +730,7 @@ if __name__ == "__main__":
     print("Task: return_request")
 
     results = memory.hybrid_retrieve(
-        query_embedding=[0.1, 0.2, 0.3, 0.4, 0.5] * 10,
+        query_embedding=returns_embedding,
         user_id="user-123",
         entities=["return-policy"],
         task_type="return_request",
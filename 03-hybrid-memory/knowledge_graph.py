@@ -18,10 +18,12 @@ that requires following explicit connections through your data.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Set, Tuple
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple, NamedTuple
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+
+import numpy as np
 
 
 class RelationType(Enum):
@@ -91,6 +93,135 @@ class Relationship:
         return True
 
 
+# Compact uint8 code for each relationship type, for the CSR arrays
+_RELATION_CODES: Dict[RelationType, int] = {
+    rel_type: code for code, rel_type in enumerate(RelationType)
+}
+
+
+# Timestamps in the temporal index are int64 microseconds since the epoch
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_MIN_MICROS = np.iinfo(np.int64).min  # open-ended valid_from
+_MAX_MICROS = np.iinfo(np.int64).max  # open-ended valid_to
+
+
+def _to_micros(point_in_time: datetime) -> int:
+    """Microseconds since the epoch (naive datetimes stay naive)."""
+    epoch = _EPOCH if point_in_time.tzinfo is None else _EPOCH_UTC
+    return (point_in_time - epoch) // _MICROSECOND
+
+
+class _TemporalBucket(NamedTuple):
+    """
+    Validity intervals of one (source, rel_type) bucket, sorted by start.
+
+    The edges valid at time t are a prefix (valid_from <= t, found by
+    binary search) filtered by one vectorized valid_to >= t comparison.
+    """
+    valid_from: np.ndarray  # int64 micros, ascending
+    valid_to: np.ndarray    # int64 micros, same order
+    order: np.ndarray       # int64 positions in the insertion-ordered bucket
+
+    @classmethod
+    def build(cls, rels: List[Relationship]) -> "_TemporalBucket":
+        starts = np.array([_to_micros(r.valid_from) if r.valid_from else _MIN_MICROS
+                           for r in rels], dtype=np.int64)
+        ends = np.array([_to_micros(r.valid_to) if r.valid_to else _MAX_MICROS
+                         for r in rels], dtype=np.int64)
+        order = np.argsort(starts, kind="stable")
+        return cls(starts[order], ends[order], order)
+
+    def valid_at(self, point: int) -> np.ndarray:
+        """Insertion-order positions of the edges valid at point."""
+        end = np.searchsorted(self.valid_from, point, side="right")
+        hits = self.order[:end][self.valid_to[:end] >= point]
+        hits.sort()
+        return hits
+
+
+class _Adjacency(NamedTuple):
+    """
+    One direction of the graph in CSR (compressed sparse row) form.
+
+    The neighbors of entity index i are col[rptr[i]:rptr[i + 1]], stored
+    contiguously, with the matching relationship type codes and positions
+    in KnowledgeGraph._relationships alongside.
+    """
+    rptr: np.ndarray        # int64, one offset per entity plus one
+    col: np.ndarray         # int32 neighbor indices, one per edge
+    rel_type: np.ndarray    # uint8 relationship type codes
+    edge: np.ndarray        # int64 positions in _relationships
+
+    @classmethod
+    def build(cls, src: np.ndarray, dst: np.ndarray, codes: np.ndarray,
+              num_entities: int) -> "_Adjacency":
+        # Stable sort keeps each entity's edges in insertion order
+        order = np.argsort(src, kind="stable")
+        rptr = np.zeros(num_entities + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=num_entities), out=rptr[1:])
+        return cls(rptr, dst[order].astype(np.int32), codes[order], order)
+
+    def neighbors(self, i: int) -> np.ndarray:
+        return self.col[self.rptr[i]:self.rptr[i + 1]]
+
+    def expand(self, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Every edge out of the frontier nodes as (sources, neighbors) arrays,
+        in frontier order and then edge order, gathered without a Python loop.
+        """
+        starts = self.rptr[frontier]
+        counts = self.rptr[frontier + 1] - starts
+        # Edge slot j of frontier node k sits at starts[k] + (j - offset[k])
+        exclusive = np.cumsum(counts) - counts
+        positions = np.arange(counts.sum()) + np.repeat(starts - exclusive, counts)
+        return np.repeat(frontier, counts), self.col[positions]
+
+
+# Comparison operators accepted by KnowledgeGraph.find_relationships
+_COMPARISONS = {
+    "<": np.less, "<=": np.less_equal, ">": np.greater,
+    ">=": np.greater_equal, "==": np.equal, "!=": np.not_equal,
+}
+
+
+@dataclass
+class _PropertyColumn:
+    """
+    One numeric relationship property for one relationship type, stored
+    column-wise: the positions in KnowledgeGraph._relationships of the
+    edges that have it, and its values, in parallel arrays that double
+    when full. A filter over the property is one vectorized comparison.
+    """
+    edges: np.ndarray = field(default_factory=lambda: np.empty(16, dtype=np.int64))
+    values: np.ndarray = field(default_factory=lambda: np.empty(16, dtype=np.float64))
+    size: int = 0
+
+    def append(self, edge: int, value: float) -> None:
+        if self.size == len(self.edges):
+            self.edges = np.concatenate((self.edges, np.empty_like(self.edges)))
+            self.values = np.concatenate((self.values, np.empty_like(self.values)))
+        self.edges[self.size] = edge
+        self.values[self.size] = value
+        self.size += 1
+
+    def where(self, op: str, value: float) -> np.ndarray:
+        """Positions of the edges whose value satisfies `value op`."""
+        mask = _COMPARISONS[op](self.values[:self.size], value)
+        return self.edges[:self.size][mask]
+
+
+# find_all_connected switches to bottom-up levels once the frontier holds
+# more than this share of all entities, and back below the second
+_BOTTOM_UP_ENTER = 0.05
+_BOTTOM_UP_EXIT = 0.01
+
+# Bounded find_all_connected results kept per graph, least recently used
+# evicted first
+_NEIGHBORHOOD_CACHE_SIZE = 256
+
+
 class KnowledgeGraph:
     """
     A simple knowledge graph implementation.
@@ -112,18 +243,89 @@ class KnowledgeGraph:
         # Indexes for fast lookup
         self._outgoing: Dict[str, List[Relationship]] = defaultdict(list)
         self._incoming: Dict[str, List[Relationship]] = defaultdict(list)
+        # Same, keyed by (entity_id, rel_type) for typed lookups
+        self._outgoing_typed: Dict[Tuple[str, RelationType], List[Relationship]] = \
+            defaultdict(list)
+        self._incoming_typed: Dict[Tuple[str, RelationType], List[Relationship]] = \
+            defaultdict(list)
         self._by_type: Dict[str, List[Entity]] = defaultdict(list)
 
+        # Compact form used by the traversals: entity ids interned to dense
+        # ints, edges packed into CSR arrays (rebuilt lazily after changes)
+        self._id_to_idx: Dict[str, int] = {}
+        self._idx_to_id: List[str] = []
+        self._csr_out: Optional[_Adjacency] = None
+        self._csr_in: Optional[_Adjacency] = None
+
+        # Derived from the CSR, so dropped with it: connected component
+        # labels and cached (start_id, max_hops) -> neighborhood results
+        self._components: Optional[np.ndarray] = None
+        self._neighborhoods: "OrderedDict[Tuple[str, int], frozenset]" = \
+            OrderedDict()
+
+        # Numeric relationship properties, columnar: rel_type -> name -> column
+        self._rel_props: Dict[RelationType, Dict[str, _PropertyColumn]] = \
+            defaultdict(dict)
+
+        # Per-(source, rel_type) validity intervals, built on first query
+        self._temporal: Dict[Tuple[str, RelationType], _TemporalBucket] = {}
+
     def add_entity(self, entity: Entity) -> None:
         """Add an entity to the graph."""
         self._entities[entity.entity_id] = entity
         self._by_type[entity.entity_type].append(entity)
+        self._intern(entity.entity_id)
 
     def add_relationship(self, rel: Relationship) -> None:
         """Add a relationship to the graph."""
+        for name, value in rel.properties.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                columns = self._rel_props[rel.rel_type]
+                if name not in columns:
+                    columns[name] = _PropertyColumn()
+                columns[name].append(len(self._relationships), value)
         self._relationships.append(rel)
         self._outgoing[rel.source_id].append(rel)
         self._incoming[rel.target_id].append(rel)
+        self._outgoing_typed[(rel.source_id, rel.rel_type)].append(rel)
+        self._incoming_typed[(rel.target_id, rel.rel_type)].append(rel)
+        self._intern(rel.source_id)
+        self._intern(rel.target_id)
+        self._invalidate_structure()
+        self._temporal.pop((rel.source_id, rel.rel_type), None)
+
+    def _intern(self, entity_id: str) -> int:
+        """Dense int index for an entity id, assigned on first sight."""
+        idx = self._id_to_idx.get(entity_id)
+        if idx is None:
+            idx = self._id_to_idx[entity_id] = len(self._idx_to_id)
+            self._idx_to_id.append(entity_id)
+            self._invalidate_structure()  # CSR rows are per entity
+        return idx
+
+    def _invalidate_structure(self) -> None:
+        """Drop the CSR arrays and everything computed from them."""
+        self._csr_out = self._csr_in = None
+        self._components = None
+        self._neighborhoods.clear()
+
+    def _adjacency(self) -> Tuple[_Adjacency, _Adjacency]:
+        """Outgoing and incoming CSR adjacency, built on first use."""
+        if self._csr_out is None:
+            num_edges = len(self._relationships)
+            src = np.fromiter(
+                (self._id_to_idx[r.source_id] for r in self._relationships),
+                dtype=np.int64, count=num_edges)
+            dst = np.fromiter(
+                (self._id_to_idx[r.target_id] for r in self._relationships),
+                dtype=np.int64, count=num_edges)
+            codes = np.fromiter(
+                (_RELATION_CODES[r.rel_type] for r in self._relationships),
+                dtype=np.uint8, count=num_edges)
+            num_entities = len(self._idx_to_id)
+            self._csr_out = _Adjacency.build(src, dst, codes, num_entities)
+            self._csr_in = _Adjacency.build(dst, src, codes, num_entities)
+        return self._csr_out, self._csr_in
 
     def get_entity(self, entity_id: str) -> Optional[Entity]:
         """Get an entity by ID."""
@@ -136,18 +338,16 @@ class KnowledgeGraph:
     def get_outgoing(self, entity_id: str,
                      rel_type: Optional[RelationType] = None) -> List[Relationship]:
         """Get outgoing relationships from an entity."""
-        rels = self._outgoing.get(entity_id, [])
         if rel_type:
-            rels = [r for r in rels if r.rel_type == rel_type]
-        return rels
+            return self._outgoing_typed.get((entity_id, rel_type), [])
+        return self._outgoing.get(entity_id, [])
 
     def get_incoming(self, entity_id: str,
                      rel_type: Optional[RelationType] = None) -> List[Relationship]:
         """Get incoming relationships to an entity."""
-        rels = self._incoming.get(entity_id, [])
         if rel_type:
-            rels = [r for r in rels if r.rel_type == rel_type]
-        return rels
+            return self._incoming_typed.get((entity_id, rel_type), [])
+        return self._incoming.get(entity_id, [])
 
     # =========================================================================
     # Multi-Hop Traversal (The key capability)
@@ -162,78 +362,278 @@ class KnowledgeGraph:
         Returns paths like: [project-apollo] -> [issue-1] -> [budget-q3] -> [sarah]
 
         This is the multi-hop reasoning that vector search CANNOT do.
+
+        Only simple paths are returned: a path never revisits an entity,
+        so cycles in the graph are pruned rather than re-expanded. Patterns
+        longer than max_depth hops return no paths.
+
+        Use traverse_iter() to stop after the first few paths, or
+        traverse_edges() to get the relationships along each path.
         """
-        if not path_pattern:
-            return [[start_id]]
-
-        current_rel_type = path_pattern[0]
-        remaining_pattern = path_pattern[1:]
-
-        paths = []
-        for rel in self.get_outgoing(start_id, current_rel_type):
-            if remaining_pattern:
-                # Continue traversal
-                sub_paths = self.traverse(rel.target_id, remaining_pattern, max_depth - 1)
-                for sub_path in sub_paths:
-                    paths.append([start_id] + sub_path)
-            else:
-                # End of pattern
-                paths.append([start_id, rel.target_id])
+        return list(self.traverse_iter(start_id, path_pattern, max_depth))
+
+    def traverse_iter(self, start_id: str, path_pattern: List[RelationType],
+                      max_depth: int = 10) -> Iterator[List[str]]:
+        """
+        Yield traverse() paths one at a time, in the same order.
+
+        The search advances only as paths are consumed, so a caller that
+        needs the first N results doesn't pay for the rest.
+        """
+        if len(path_pattern) > max_depth:
+            return
+        if start_id not in self._id_to_idx:
+            if not path_pattern:
+                yield [start_id]
+            return
+
+        for nodes, _ in self._traverse_dfs(start_id, path_pattern):
+            yield [self._idx_to_id[i] for i in nodes]
+
+    def traverse_edges(self, start_id: str, path_pattern: List[RelationType],
+                       max_depth: int = 10) -> List[List[Relationship]]:
+        """
+        Like traverse(), but each path is the list of relationships taken.
+
+        The entities are path[0].source_id followed by each target_id, so
+        callers printing a relationship chain needn't look the edges up again.
+        """
+        if len(path_pattern) > max_depth or start_id not in self._id_to_idx:
+            return []
+
+        return [[self._relationships[e] for e in edges]
+                for _, edges in self._traverse_dfs(start_id, path_pattern)]
 
-        return paths
+    def _traverse_dfs(self, start_id: str, path_pattern: List[RelationType]
+                      ) -> Iterator[Tuple[List[int], List[int]]]:
+        """
+        Yield (entity indexes, relationship positions) for each simple path
+        from start_id matching path_pattern, in edge-insertion order.
+
+        Iterative depth-first search, so long patterns can't hit Python's
+        recursion limit. It keeps one stack of neighbor iterators and a
+        single path that is extended and backtracked in place; only
+        complete paths are copied. Works on interned entity indexes and
+        the CSR adjacency; callers translate back to ids and Relationships.
+        """
+        out_adj, _ = self._adjacency()
+        codes = [_RELATION_CODES[rel_type] for rel_type in path_pattern]
+
+        def typed_edges(node: int, code: int) -> Iterator[Tuple[int, int]]:
+            lo, hi = out_adj.rptr[node], out_adj.rptr[node + 1]
+            slots = lo + np.flatnonzero(out_adj.rel_type[lo:hi] == code)
+            return zip(out_adj.col[slots].tolist(), out_adj.edge[slots].tolist())
+
+        start = self._id_to_idx[start_id]
+        if not codes:
+            yield [start], []
+            return
+
+        path, edges, on_path = [start], [], {start}
+        # stack[d] walks the matching edges out of path[d]
+        stack = [typed_edges(start, codes[0])]
+        while stack:
+            for target, edge in stack[-1]:
+                if target in on_path:
+                    continue
+                if len(path) == len(codes):
+                    yield path + [target], edges + [edge]
+                    continue
+                path.append(target)
+                edges.append(edge)
+                on_path.add(target)
+                stack.append(typed_edges(target, codes[len(path) - 1]))
+                break
+            else:
+                # path[-1]'s edges are exhausted: backtrack
+                stack.pop()
+                if stack:
+                    on_path.discard(path.pop())
+                    edges.pop()
 
     def shortest_path(self, source_id: str, target_id: str,
                       max_depth: int = 5) -> Optional[List[str]]:
         """
         Find the shortest path between two entities.
 
-        Uses BFS (Breadth-First Search) to find the minimum-hop path.
+        Uses bidirectional BFS (Breadth-First Search): one search follows
+        outgoing edges from the source, the other follows incoming edges
+        back from the target, and each step expands whichever frontier is
+        smaller by one whole level. They meet in the middle after exploring
+        ~2 * b^(L/2) entities instead of ~b^L.
+
+        Each side keeps a parent array (-1 = unvisited) over the interned
+        CSR adjacency; the path is the two parent chains joined at the
+        meeting entity. The two depths together are capped at max_depth.
         """
         if source_id == target_id:
             return [source_id]
 
-        visited = {source_id}
-        queue = [(source_id, [source_id])]
-
-        while queue:
-            current_id, path = queue.pop(0)
-
-            if len(path) > max_depth:
-                continue
-
-            for rel in self.get_outgoing(current_id):
-                if rel.target_id == target_id:
-                    return path + [target_id]
-
-                if rel.target_id not in visited:
-                    visited.add(rel.target_id)
-                    queue.append((rel.target_id, path + [rel.target_id]))
+        source = self._id_to_idx.get(source_id)
+        target = self._id_to_idx.get(target_id)
+        if source is None or target is None:
+            return None
+        adjacency = self._adjacency()  # (outgoing, incoming)
+
+        # Side 0 searches forward from source, side 1 backward from target
+        parents = (np.full(len(self._idx_to_id), -1, dtype=np.int64),
+                   np.full(len(self._idx_to_id), -1, dtype=np.int64))
+        parents[0][source] = source
+        parents[1][target] = target
+        frontiers = [np.array([source], dtype=np.int64),
+                     np.array([target], dtype=np.int64)]
+
+        for _ in range(max_depth):
+            side = 0 if frontiers[0].size <= frontiers[1].size else 1
+            frontier = self._bfs_level(adjacency[side], parents[side],
+                                       frontiers[side])
+            frontiers[side] = frontier
+
+            met = frontier[parents[1 - side][frontier] != -1]
+            if met.size:
+                node = int(met[0])
+                forward = self._path_from_parents(parents[0], node)
+                backward = self._path_from_parents(parents[1], node)
+                return forward + backward[-2::-1]
+            if not frontier.size:
+                break
 
         return None  # No path found
 
-    def find_all_connected(self, start_id: str, max_hops: int = 3) -> Set[str]:
+    @staticmethod
+    def _bfs_level(adj: _Adjacency, parent: np.ndarray,
+                   frontier: np.ndarray) -> np.ndarray:
+        """
+        Expand one BFS level: record parents of newly reached entities in
+        parent and return them as the next frontier.
+        """
+        sources, neighbors = adj.expand(frontier)
+        fresh = parent[neighbors] == -1
+        sources, neighbors = sources[fresh], neighbors[fresh]
+
+        # First discovery wins, in queue order, as in a FIFO BFS
+        _, first = np.unique(neighbors, return_index=True)
+        first.sort()
+        frontier = neighbors[first].astype(np.int64)
+        parent[frontier] = sources[first]
+        return frontier
+
+    def _path_from_parents(self, parent: np.ndarray, node: int) -> List[str]:
+        """Walk parent pointers back from node to the BFS root."""
+        path = [self._idx_to_id[node]]
+        while parent[node] != node:
+            node = int(parent[node])
+            path.append(self._idx_to_id[node])
+        path.reverse()
+        return path
+
+    def find_all_connected(self, start_id: str,
+                           max_hops: Optional[int] = 3) -> Set[str]:
         """
         Find all entities within N hops of the starting entity.
 
         Useful for understanding the "neighborhood" of an entity.
+        Follows edges in both directions. With max_hops=None the whole
+        connected component is returned, read from component labels that
+        are computed once and reused until the graph changes. Bounded
+        neighborhoods are cached too (LRU), so repeated impact-analysis
+        queries for the same entity are a dictionary lookup.
         """
-        visited = {start_id}
-        frontier = {start_id}
+        start = self._id_to_idx.get(start_id)
+        if start is None:
+            return {start_id}
+
+        if max_hops is None:
+            labels = self._component_labels()
+            members = np.flatnonzero(labels == labels[start])
+            return {self._idx_to_id[node] for node in members.tolist()}
+
+        key = (start_id, max_hops)
+        cached = self._neighborhoods.get(key)
+        if cached is not None:
+            self._neighborhoods.move_to_end(key)
+            return set(cached)
+
+        neighborhood = self._neighborhood(start, max_hops)
+        self._neighborhoods[key] = frozenset(neighborhood)
+        if len(self._neighborhoods) > _NEIGHBORHOOD_CACHE_SIZE:
+            self._neighborhoods.popitem(last=False)
+        return neighborhood
+
+    def _neighborhood(self, start: int, max_hops: int) -> Set[str]:
+        """
+        Entities within max_hops of start, in either edge direction.
+
+        Expands a whole level at a time over the CSR adjacency, against a
+        visited bitmap. Direction-optimizing: small frontiers expand
+        top-down (scan the frontier's edges), but once the frontier passes
+        5% of the graph - e.g. after reaching a hub entity - levels run
+        bottom-up instead (scan unvisited entities' edges for a frontier
+        neighbor), switching back below 1%. Both give the same levels.
+        """
+        out_adj, in_adj = self._adjacency()
+        num_entities = len(self._idx_to_id)
+
+        visited = np.zeros(num_entities, dtype=bool)
+        visited[start] = True
+        frontier = np.array([start], dtype=np.int64)
+        bottom_up = False
 
         for _ in range(max_hops):
-            new_frontier = set()
-            for entity_id in frontier:
-                for rel in self.get_outgoing(entity_id):
-                    if rel.target_id not in visited:
-                        visited.add(rel.target_id)
-                        new_frontier.add(rel.target_id)
-                for rel in self.get_incoming(entity_id):
-                    if rel.source_id not in visited:
-                        visited.add(rel.source_id)
-                        new_frontier.add(rel.source_id)
-            frontier = new_frontier
-
-        return visited
+            if not frontier.size:
+                break
+            if bottom_up:
+                bottom_up = frontier.size >= _BOTTOM_UP_EXIT * num_entities
+            else:
+                bottom_up = frontier.size > _BOTTOM_UP_ENTER * num_entities
+
+            if bottom_up:
+                in_frontier = np.zeros(num_entities, dtype=bool)
+                in_frontier[frontier] = True
+                unvisited = np.flatnonzero(~visited)
+                # Edges are undirected here: check both adjacency lists
+                reached = [sources[in_frontier[neighbors]]
+                           for sources, neighbors in (out_adj.expand(unvisited),
+                                                      in_adj.expand(unvisited))]
+                frontier = np.unique(np.concatenate(reached))
+            else:
+                neighbors = np.concatenate(
+                    (out_adj.expand(frontier)[1], in_adj.expand(frontier)[1]))
+                frontier = np.unique(neighbors[~visited[neighbors]]).astype(np.int64)
+            visited[frontier] = True
+
+        return {self._idx_to_id[node] for node in np.flatnonzero(visited).tolist()}
+
+    def _component_labels(self) -> np.ndarray:
+        """
+        Weakly connected component label of every entity, built on first use.
+
+        Min-label propagation: each pass hooks the larger label of every
+        edge's endpoints onto the smaller, then pointer-jumps labels to
+        their roots, until no edge joins two labels.
+        """
+        if self._components is None:
+            out_adj, _ = self._adjacency()
+            num_entities = len(self._idx_to_id)
+            src = np.repeat(np.arange(num_entities), np.diff(out_adj.rptr))
+            dst = out_adj.col
+
+            labels = np.arange(num_entities)
+            while True:
+                low = np.minimum(labels[src], labels[dst])
+                hooked = labels.copy()
+                np.minimum.at(hooked, labels[src], low)
+                np.minimum.at(hooked, labels[dst], low)
+                while True:
+                    jumped = hooked[hooked]
+                    if np.array_equal(jumped, hooked):
+                        break
+                    hooked = jumped
+                if np.array_equal(hooked, labels):
+                    break
+                labels = hooked
+            self._components = labels
+        return self._components
 
     # =========================================================================
     # Temporal Queries (Time-aware knowledge graphs)
@@ -246,9 +646,56 @@ class KnowledgeGraph:
 
         Key Concept: Temporal knowledge graphs add TIME as a dimension.
         "What was the status of Project X on January 15th?"
+
+        Uses a per-(entity, rel_type) interval index sorted by valid_from,
+        so each query is a binary search plus one array comparison rather
+        than an is_valid_at call per edge. Results keep insertion order.
+        The index is built from valid_from/valid_to when first queried, so
+        close a relationship with end_relationship() rather than setting
+        rel.valid_to directly.
+        """
+        key = (entity_id, rel_type)
+        rels = self._outgoing_typed.get(key)
+        if not rels:
+            return []
+
+        bucket = self._temporal.get(key)
+        if bucket is None:
+            bucket = self._temporal[key] = _TemporalBucket.build(rels)
+        return [rels[i] for i in bucket.valid_at(_to_micros(point_in_time)).tolist()]
+
+    def end_relationship(self, rel: Relationship, valid_to: datetime) -> None:
+        """
+        Mark a relationship as no longer valid after valid_to.
+
+        Example: Sarah leaves the team, so her MEMBER_OF edge ends today.
+        """
+        rel.valid_to = valid_to
+        self._temporal.pop((rel.source_id, rel.rel_type), None)
+
+    # =========================================================================
+    # Property Queries
+    # =========================================================================
+
+    def find_relationships(self, rel_type: RelationType, prop_name: str,
+                           op: str, value: float) -> List[Relationship]:
+        """
+        Find relationships of a type whose numeric property passes a test.
+
+        Example: find_relationships(DELAYED_BY, "delay_days", ">", 14)
+
+        Numeric properties are copied into per-type columns when the
+        relationship is added, so the filter is one array comparison
+        rather than a dict lookup per edge. Later edits to rel.properties
+        are not reflected. Results are in insertion order.
         """
-        rels = self.get_outgoing(entity_id, rel_type)
-        return [r for r in rels if r.is_valid_at(point_in_time)]
+        if op not in _COMPARISONS:
+            raise ValueError(f"Unsupported comparison {op!r}; "
+                             f"expected one of {sorted(_COMPARISONS)}")
+        column = self._rel_props.get(rel_type, {}).get(prop_name)
+        if column is None:
+            return []
+        return [self._relationships[i] for i in column.where(op, value).tolist()]
 
 
 # =============================================================================
@@ -340,22 +787,20 @@ if __name__ == "__main__":
 
     # Traverse: Project Apollo -> [delayed by] -> Issue -> [affects] -> Budget -> [approved by] -> Person
     path_pattern = [RelationType.DELAYED_BY, RelationType.AFFECTS, RelationType.APPROVED_BY]
-    paths = graph.traverse("project-apollo", path_pattern)
+    paths = graph.traverse_edges("project-apollo", path_pattern)
 
     print("\nTraversal Path:")
-    for path in paths:
+    for rels in paths:
+        path = [rels[0].source_id] + [rel.target_id for rel in rels]
         entities = [graph.get_entity(eid) for eid in path]
         print("  " + " -> ".join(e.name for e in entities if e))
 
         # Show the relationships along the path
         print("\n  Relationship chain:")
-        for i in range(len(path) - 1):
-            rels = graph.get_outgoing(path[i])
-            for rel in rels:
-                if rel.target_id == path[i+1]:
-                    print(f"    {path[i]} --[{rel.rel_type.value}]--> {path[i+1]}")
-                    if rel.properties:
-                        print(f"      Properties: {rel.properties}")
+        for rel in rels:
+            print(f"    {rel.source_id} --[{rel.rel_type.value}]--> {rel.target_id}")
+            if rel.properties:
+                print(f"      Properties: {rel.properties}")
 
     # Shortest path
     print("\n[2] Shortest Path Query")
@@ -16,10 +16,20 @@ Key Concept: Vector search finds relevant information even when
 exact keywords don't match - 'car' and 'automobile' cluster together.
 """
 
-import math
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Tuple, Optional
-import hashlib
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# hnswlib gives sub-linear approximate nearest-neighbor search for large
+# stores. Without it, similarity_search always scans every document.
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
 
 
 @dataclass
@@ -34,12 +44,22 @@ class Document:
     """
     doc_id: str
     content: str
-    embedding: List[float]
+    # float32; lists are converted on construction. Left out of ==, which
+    # can't compare arrays elementwise to a single bool.
+    embedding: np.ndarray = field(compare=False)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
     # For contextual embeddings (video concept)
     context_prefix: str = ""  # e.g., "Document: Policy Manual, Section: Returns"
 
+    # L2 norm of the embedding, computed once
+    norm: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # A 1536-dim List[float] is ~50 KB of boxed floats; float32 is 6 KB
+        self.embedding = np.asarray(self.embedding, dtype=np.float32)
+        self.norm = float(np.linalg.norm(self.embedding))
+
 
 @dataclass
 class SearchResult:
@@ -49,6 +69,37 @@ class SearchResult:
     rank: int
 
 
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, highest first.
+
+    Partitions instead of fully sorting (O(n) vs O(n log n)), then sorts
+    just the winners. Ties go to the lower index, as with a stable sort.
+    """
+    if k < len(scores):
+        kth = -np.partition(-scores, k - 1)[k - 1]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[:k - len(above)]
+        top = np.concatenate((above, ties))
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def quantize_int8(vec: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Symmetrically quantize a vector to int8.
+
+    Returns (int8_vec, scale) with vec ~= int8_vec * scale. For normalized
+    embeddings this loses little ranking accuracy while cutting memory
+    by another 4x over float32.
+    """
+    vec = np.asarray(vec, dtype=np.float32)
+    peak = float(np.abs(vec).max()) if vec.size else 0.0
+    scale = peak / 127.0 if peak else 1.0
+    return np.round(vec / scale).astype(np.int8), scale
+
+
 class SimpleVectorStore:
     """
     A simplified vector store for educational purposes.
@@ -59,14 +110,105 @@ class SimpleVectorStore:
     - GPU acceleration for large-scale deployments
 
     Key Principle: Embeddings capture MEANING, not just keywords.
+
+    Embeddings are L2-normalized once when added and kept as rows of one
+    float32 matrix (a preallocated buffer that doubles when full), so a
+    search is a single matrix-vector product. With quantize=True the rows
+    are stored as int8 plus a per-row scale instead, which saves memory;
+    searches dequantize them in blocks to run near float32 speed.
+
+    Once the store holds ann_min_items documents (and hnswlib is
+    installed), an HNSW approximate index is built from the stored
+    embeddings and searches go through it instead of the full scan.
+    Metadata filters are applied to an over-fetched candidate set
+    (ann_overfetch x top_k).
+
+    Exact scans over parallel_min_items or more documents are split into
+    row shards scored on a thread pool; NumPy releases the GIL inside the
+    products, so the shards run concurrently.
     """
 
-    def __init__(self):
-        self._documents: Dict[str, Document] = {}
+    # Whether to L2-normalize embeddings; see CosineSearchStore
+    normalize = True
+    # Rows dequantized per step when scoring a quantized store
+    dequantize_block = 4096
+
+    def __init__(self, quantize: bool = False, ann_min_items: int = 5000,
+                 ann_overfetch: int = 4, parallel_min_items: int = 100_000,
+                 parallel_workers: Optional[int] = None):
+        self.quantize = quantize
+        self.ann_min_items = ann_min_items
+        self.ann_overfetch = ann_overfetch
+        self.parallel_min_items = parallel_min_items
+        self.parallel_workers = parallel_workers or os.cpu_count() or 1
+        self._ann = None
+        self._documents: List[Document] = []
+        self._positions: Dict[str, int] = {}  # doc_id -> row
+        self._embeddings: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None  # per-row, int8 mode only
 
     def add_document(self, doc: Document) -> None:
-        """Add a document to the store."""
-        self._documents[doc.doc_id] = doc
+        """Add a document to the store (replacing any with the same id)."""
+        vector = np.asarray(doc.embedding, dtype=np.float32)
+        if self._embeddings is None:
+            dtype = np.int8 if self.quantize else np.float32
+            self._embeddings = np.empty((64, vector.size), dtype=dtype)
+            self._scales = np.empty(64, dtype=np.float32)
+        elif vector.size != self._embeddings.shape[1]:
+            raise ValueError("Vectors must have same dimensions")
+
+        row = self._positions.get(doc.doc_id)
+        if row is None:
+            row = len(self._documents)
+            if row == len(self._embeddings):
+                self._grow()
+            self._positions[doc.doc_id] = row
+            self._documents.append(doc)
+        else:
+            self._documents[row] = doc
+
+        if self.normalize and doc.norm:
+            vector = vector / doc.norm
+        if self.quantize:
+            self._embeddings[row], self._scales[row] = quantize_int8(vector)
+        else:
+            self._embeddings[row] = vector
+
+        # The HNSW index only pays off for large stores: build it in bulk
+        # when the store reaches ann_min_items, then keep it up to date
+        if self._ann is not None:
+            self._ann_add(vector, row)
+        elif hnswlib is not None and len(self._documents) >= self.ann_min_items:
+            self._ann_build()
+
+    def _ann_build(self) -> None:
+        """Create the HNSW index from every stored embedding at once."""
+        n = len(self._documents)
+        rows = self._embeddings[:n]
+        if self.quantize:
+            rows = rows.astype(np.float32) * self._scales[:n, None]
+        # Unnormalized stores rank by inner product, like the full scan
+        space = "cosine" if self.normalize else "ip"
+        self._ann = hnswlib.Index(space=space, dim=rows.shape[1])
+        self._ann.init_index(max_elements=max(1024, 2 * n),
+                             ef_construction=200, M=16)
+        self._ann.add_items(rows, np.arange(n))
+
+    def _ann_add(self, vector: np.ndarray, label: int) -> None:
+        """Add (or replace) one embedding in the HNSW index, growing it as needed."""
+        if label >= self._ann.get_max_elements():
+            self._ann.resize_index(2 * self._ann.get_max_elements())
+        self._ann.add_items(vector[None, :], [label])
+
+    def _grow(self) -> None:
+        """Double the capacity of the embedding buffers."""
+        rows, dims = self._embeddings.shape
+        grown = np.empty((2 * rows, dims), dtype=self._embeddings.dtype)
+        grown[:rows] = self._embeddings
+        self._embeddings = grown
+        scales = np.empty(2 * rows, dtype=np.float32)
+        scales[:rows] = self._scales
+        self._scales = scales
 
     def add_documents(self, docs: List[Document]) -> None:
         """Add multiple documents."""
@@ -88,47 +230,100 @@ class SimpleVectorStore:
         Key Principle: This finds semantically similar content
         even with completely different wording.
         """
-        results = []
-
-        for doc in self._documents.values():
-            # Apply metadata filter if provided
-            if metadata_filter:
-                if not self._matches_filter(doc.metadata, metadata_filter):
-                    continue
-
-            # Calculate cosine similarity
-            similarity = self._cosine_similarity(query_embedding, doc.embedding)
-            results.append((doc, similarity))
-
-        # Sort by similarity (highest first)
-        results.sort(key=lambda x: x[1], reverse=True)
+        if not self._documents or top_k <= 0:
+            return []
 
-        # Return top_k results
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if query.size != self._embeddings.shape[1]:
+            raise ValueError("Vectors must have same dimensions")
+        if self.normalize:
+            norm = np.linalg.norm(query)
+            if norm:
+                query = query / norm
+
+        if self._ann is not None and len(self._documents) >= self.ann_min_items:
+            results = self._ann_search(query, top_k, metadata_filter)
+            if results is not None:
+                return results
+
+        # Cosine similarity against every document at once
+        scores = self._scores(query)
+
+        # Apply metadata filter if provided
+        if metadata_filter:
+            candidates = np.array([
+                i for i, doc in enumerate(self._documents)
+                if self._matches_filter(doc.metadata, metadata_filter)
+            ], dtype=np.int64)
+        else:
+            candidates = np.arange(len(self._documents))
+
+        # Return top_k results, highest similarity first
+        top = candidates[_top_k(scores[candidates], top_k)]
         return [
-            SearchResult(document=doc, similarity_score=score, rank=i+1)
-            for i, (doc, score) in enumerate(results[:top_k])
+            SearchResult(document=self._documents[i],
+                         similarity_score=float(scores[i]), rank=rank + 1)
+            for rank, i in enumerate(top.tolist())
         ]
 
-    @staticmethod
-    def _cosine_similarity(vec_a: List[float], vec_b: List[float]) -> float:
+    def _scores(self, query: np.ndarray) -> np.ndarray:
+        """Similarity of the (prepared) query to every stored document."""
+        n = len(self._documents)
+        scores = np.empty(n, dtype=np.float32)
+
+        def score_rows(lo: int, hi: int) -> None:
+            if not self.quantize:
+                np.matmul(self._embeddings[lo:hi], query, out=scores[lo:hi])
+                return
+            # NumPy's integer matmul doesn't use BLAS, so dequantize a
+            # cache-sized block at a time and score it in float32
+            for start in range(lo, hi, self.dequantize_block):
+                stop = min(start + self.dequantize_block, hi)
+                block = self._embeddings[start:stop].astype(np.float32)
+                np.matmul(block, query, out=scores[start:stop])
+            scores[lo:hi] *= self._scales[lo:hi]
+
+        # Shards keep at least parallel_min_items // 4 rows each
+        workers = min(self.parallel_workers, n // max(1, self.parallel_min_items // 4))
+        if n < self.parallel_min_items or workers < 2:
+            score_rows(0, n)  # thread startup would cost more than it saves
+        else:
+            bounds = np.linspace(0, n, workers + 1, dtype=np.int64).tolist()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(score_rows, bounds[:-1], bounds[1:]))
+        return scores
+
+    def _ann_search(self, query: np.ndarray, top_k: int,
+                    metadata_filter: Optional[Dict[str, Any]]
+                    ) -> Optional[List[SearchResult]]:
         """
-        Calculate cosine similarity between two vectors.
-
-        cosine_sim = (A · B) / (||A|| * ||B||)
+        Approximate top-k search through the HNSW index.
 
-        This measures the angle between vectors, not their magnitude.
+        Returns None if a metadata filter leaves fewer than top_k of the
+        over-fetched candidates, so the caller can fall back to the scan.
         """
-        if len(vec_a) != len(vec_b):
-            raise ValueError("Vectors must have same dimensions")
-
-        dot_product = sum(a * b for a, b in zip(vec_a, vec_b))
-        magnitude_a = math.sqrt(sum(a * a for a in vec_a))
-        magnitude_b = math.sqrt(sum(b * b for b in vec_b))
-
-        if magnitude_a == 0 or magnitude_b == 0:
-            return 0.0
-
-        return dot_product / (magnitude_a * magnitude_b)
+        n = len(self._documents)
+        k = min(n, top_k * self.ann_overfetch if metadata_filter else top_k)
+        self._ann.set_ef(max(50, k))  # ef must be at least k
+        labels, distances = self._ann.knn_query(query, k=k)
+
+        hits = []
+        for label, distance in zip(labels[0].tolist(), distances[0].tolist()):
+            doc = self._documents[label]
+            if metadata_filter and not self._matches_filter(doc.metadata,
+                                                            metadata_filter):
+                continue
+            # hnswlib reports 1 - cosine (or 1 - inner product) as distance
+            hits.append((doc, 1.0 - distance))
+            if len(hits) == top_k:
+                break
+
+        if len(hits) < top_k and k < n:
+            return None
+        return [
+            SearchResult(document=doc, similarity_score=score, rank=rank + 1)
+            for rank, (doc, score) in enumerate(hits)
+        ]
 
     @staticmethod
     def _matches_filter(metadata: Dict[str, Any],
@@ -140,6 +335,19 @@ class SimpleVectorStore:
         return True
 
 
+class CosineSearchStore(SimpleVectorStore):
+    """
+    Vector store for embeddings that are already unit length.
+
+    Skips normalization on insert and on every query and ranks by the raw
+    dot product, which equals cosine similarity for unit vectors - the
+    inner-product index mode of Faiss or Pinecone. SimpleEmbedder output
+    qualifies; unnormalized input gets magnitude-weighted scores.
+    """
+
+    normalize = False
+
+
 class SimpleEmbedder:
     """
     A simplified embedding generator for educational purposes.
@@ -158,7 +366,7 @@ class SimpleEmbedder:
         self.vocab_size = vocab_size
         # In production, this would be a trained neural network
 
-    def embed(self, text: str) -> List[float]:
+    def embed(self, text: str) -> np.ndarray:
         """
         Generate an embedding for the given text.
 
@@ -168,20 +376,40 @@ class SimpleEmbedder:
         # Simplified: hash words to create pseudo-embedding
         # Real embeddings capture meaning, not just word presence
         words = text.lower().split()
-        embedding = [0.0] * self.vocab_size
+        embedding = np.zeros(self.vocab_size, dtype=np.float32)
 
-        for word in words:
-            # Hash word to get consistent index
-            index = int(hashlib.md5(word.encode()).hexdigest(), 16) % self.vocab_size
-            embedding[index] += 1.0
+        # Hash word to get consistent index. CRC32 is stable across runs
+        # (unlike the salted built-in hash()) and far cheaper than MD5.
+        indices = [zlib.crc32(word.encode()) % self.vocab_size for word in words]
+        np.add.at(embedding, indices, 1.0)
 
         # Normalize to unit vector
-        magnitude = math.sqrt(sum(x * x for x in embedding))
+        magnitude = np.linalg.norm(embedding)
         if magnitude > 0:
-            embedding = [x / magnitude for x in embedding]
+            embedding /= magnitude
 
         return embedding
 
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed several texts at once, one row per text.
+
+        Same vectors as calling embed() on each, but counts are scattered
+        into one float32 matrix and every row is normalized together.
+        """
+        rows, cols = [], []
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                rows.append(row)
+                cols.append(zlib.crc32(word.encode()) % self.vocab_size)
+
+        embeddings = np.zeros((len(texts), self.vocab_size), dtype=np.float32)
+        np.add.at(embeddings, (rows, cols), 1.0)
+
+        magnitudes = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        np.divide(embeddings, magnitudes, out=embeddings, where=magnitudes > 0)
+        return embeddings
+
 
 def demonstrate_contextual_embeddings():
     """
@@ -15,6 +15,8 @@ Key Concept: As agents run for extended periods, conversation histories
 grow without bound. Compaction keeps context manageable.
 """
 
+import re
+from collections import Counter, deque
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -33,7 +35,7 @@ class SummaryLevel(Enum):
     USER = "user"           # Long-term user summary (key patterns/preferences)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationTurn:
     """A single turn in a conversation."""
     turn_id: int
@@ -44,7 +46,7 @@ class ConversationTurn:
     summary: str = ""       # Compressed version
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionSummary:
     """Summary of an entire conversation session."""
     session_id: str
@@ -57,6 +59,11 @@ class SessionSummary:
     outcome: str = ""
 
 
+# Topic candidates: words of 7+ letters (longer words are likely more meaningful)
+_TOPIC_WORD_RE = re.compile(r"[A-Za-z]{7,}")
+_THANKS_RE = re.compile(r"thank", re.IGNORECASE)
+
+
 class SlidingWindowManager:
     """
     Implements the sliding window with summarization pattern.
@@ -74,19 +81,32 @@ class SlidingWindowManager:
         self.window_size = window_size
         self.max_summary_tokens = max_summary_tokens
 
-        self._all_turns: List[ConversationTurn] = []
-        self._summarized_history: str = ""
+        # Detailed turns, oldest first; a deque so eviction is O(1)
+        self._all_turns: deque[ConversationTurn] = deque()
+        # Summaries of evicted turns, joined only when the context is built
+        self._summary_segments: List[str] = []
+
+        # Running token totals, so get_stats() needn't rescan either part
+        self._summary_token_count = 0
+        self._detailed_token_count = 0
 
-    def add_turn(self, role: str, content: str) -> None:
-        """Add a new turn to the conversation."""
+    def add_turn(self, role: str, content: str, *,
+                 timestamp: Optional[datetime] = None) -> None:
+        """
+        Add a new turn to the conversation.
+
+        timestamp defaults to now; when loading many turns at once, pass
+        one shared value instead of reading the clock per turn.
+        """
         turn = ConversationTurn(
             turn_id=len(self._all_turns) + 1,
             role=role,
             content=content,
-            timestamp=datetime.now(),
+            timestamp=timestamp or datetime.now(),
             token_count=len(content.split())  # Rough estimate
         )
         self._all_turns.append(turn)
+        self._detailed_token_count += turn.token_count
 
         # Compact if window exceeded
         if len(self._all_turns) > self.window_size:
@@ -98,19 +118,16 @@ class SlidingWindowManager:
 
         In production, this would use an LLM to generate the summary.
         """
-        oldest = self._all_turns[0]
+        # Remove from detailed history
+        oldest = self._all_turns.popleft()
+        self._detailed_token_count -= oldest.token_count
 
         # Generate summary (simplified - real would use LLM)
         summary = self._generate_turn_summary(oldest)
 
         # Add to summarized history
-        if self._summarized_history:
-            self._summarized_history += f" {summary}"
-        else:
-            self._summarized_history = summary
-
-        # Remove from detailed history
-        self._all_turns = self._all_turns[1:]
+        self._summary_segments.append(summary)
+        self._summary_token_count += len(summary.split())
 
     def _generate_turn_summary(self, turn: ConversationTurn) -> str:
         """
@@ -140,8 +157,9 @@ class SlidingWindowManager:
         """
         parts = []
 
-        if self._summarized_history:
-            parts.append(f"## Previous Context (Summarized)\n{self._summarized_history}")
+        if self._summary_segments:
+            summarized = " ".join(self._summary_segments)
+            parts.append(f"## Previous Context (Summarized)\n{summarized}")
 
         if self._all_turns:
             detailed = "\n".join(
@@ -154,8 +172,8 @@ class SlidingWindowManager:
 
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the context."""
-        summary_tokens = len(self._summarized_history.split())
-        detailed_tokens = sum(t.token_count for t in self._all_turns)
+        summary_tokens = self._summary_token_count
+        detailed_tokens = self._detailed_token_count
 
         return {
             "total_turns": len(self._all_turns),
@@ -218,14 +236,14 @@ class HierarchicalSummarizer:
         #  - What information was exchanged?
         #  - What was the outcome/resolution?"
 
-        # Simplified implementation
-        topics = set()
-        for turn in turns:
-            # Extract key words (simplified)
-            words = turn.content.lower().split()
-            for word in words:
-                if len(word) > 6:  # Longer words likely more meaningful
-                    topics.add(word)
+        # Simplified implementation: the most frequent long words, in one
+        # regex pass per turn (no lowercased copy of each turn's content)
+        topic_counts = Counter(
+            match.group(0).lower()
+            for turn in turns
+            for match in _TOPIC_WORD_RE.finditer(turn.content)
+        )
+        topics = [word for word, _ in topic_counts.most_common(10)]
 
         summary = SessionSummary(
             session_id=session_id,
@@ -233,9 +251,9 @@ class HierarchicalSummarizer:
             start_time=turns[0].timestamp if turns else datetime.now(),
             end_time=turns[-1].timestamp if turns else datetime.now(),
             turn_count=len(turns),
-            summary=f"Session covered: {', '.join(list(topics)[:5])}",
-            key_entities=list(topics)[:10],
-            outcome="resolved" if any("thank" in t.content.lower() for t in turns) else "unknown"
+            summary=f"Session covered: {', '.join(topics[:5])}",
+            key_entities=topics,
+            outcome="resolved" if any(_THANKS_RE.search(t.content) for t in turns) else "unknown"
         )
 
         self._session_summaries[session_id] = summary
@@ -262,13 +280,19 @@ class HierarchicalSummarizer:
         profile["common_topics"].extend(session_summary.key_entities[:3])
 
         # Keep only top N topics
-        from collections import Counter
         topic_counts = Counter(profile["common_topics"])
         profile["common_topics"] = [t for t, _ in topic_counts.most_common(10)]
 
         return profile
 
 
+# (keyword, label) pairs flagged by SemanticCompressor.compress
+_KEY_PHRASES = (
+    ("return", "return_related"),
+    ("order", "order_related"),
+)
+
+
 @dataclass
 class SemanticCompressor:
     """
@@ -292,21 +316,26 @@ class SemanticCompressor:
         # Simplified implementation
         words = text.split()
 
-        # Extract potential entities (capitalized words)
-        entities = [w for w in words if w and w[0].isupper()]
-
-        # Extract numbers (potential facts)
-        numbers = [w for w in words if any(c.isdigit() for c in w)]
-
-        # Key phrases (simplified)
-        key_phrases = []
-        if "return" in text.lower():
-            key_phrases.append("return_related")
-        if "order" in text.lower():
-            key_phrases.append("order_related")
+        # One pass over the words for both:
+        # - potential entities (capitalized words)
+        # - numbers (potential facts)
+        entities = []
+        numbers = []
+        for word in words:
+            if word[0].isupper():
+                entities.append(word)
+            for char in word:
+                if char.isdigit():
+                    numbers.append(word)
+                    break
+
+        # Key phrases (simplified), against one lowercased copy
+        lower_text = text.lower()
+        key_phrases = [label for keyword, label in _KEY_PHRASES if keyword in lower_text]
 
         return {
-            "entities": list(set(entities))[:10],
+            # Deduplicated, in order of first mention
+            "entities": list(dict.fromkeys(entities))[:10],
             "numbers": numbers[:5],
             "key_phrases": key_phrases,
             "original_length": len(words),
@@ -343,8 +372,9 @@ if __name__ == "__main__":
         ("assistant", "You're welcome! Is there anything else I can help you with today?"),
     ]
 
+    now = datetime.now()
     for role, content in conversation:
-        window.add_turn(role, content)
+        window.add_turn(role, content, timestamp=now)
         print(f"  Added turn: {role[:4]}... ({len(content.split())} words)")
 
     print("\n  Context for LLM:")
@@ -362,7 +392,7 @@ if __name__ == "__main__":
 
     # Create turns for summarization
     turns = [
-        ConversationTurn(i+1, role, content, datetime.now())
+        ConversationTurn(i+1, role, content, now)
         for i, (role, content) in enumerate(conversation)
     ]
 
@@ -17,14 +17,16 @@ Cost visibility is the foundation of context economics.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from collections import defaultdict
+from collections import defaultdict, deque
 import math
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class TokenPricing:
     """
     Token pricing for different models.
@@ -48,7 +50,38 @@ MODEL_PRICING = {
 }
 
 
-@dataclass
+def _per_token_rates(pricing: TokenPricing) -> Tuple[float, float, float]:
+    """(input, output, cached) price per single token, in USD."""
+    return (pricing.input_price_per_million * 1e-6,
+            pricing.output_price_per_million * 1e-6,
+            pricing.cached_input_price_per_million * 1e-6)
+
+
+# Per-token rates for each model, computed once rather than per record
+_PRICE_TABLE: Dict[str, Tuple[float, float, float]] = {
+    name: _per_token_rates(pricing) for name, pricing in MODEL_PRICING.items()
+}
+
+
+# Models counted as "large" by OptimizationRecommender: input price at or
+# above this many $ per 1M tokens
+_EXPENSIVE_INPUT_PRICE_PER_MILLION = 2.0
+_EXPENSIVE_MODELS = frozenset(
+    name for name, pricing in MODEL_PRICING.items()
+    if pricing.input_price_per_million >= _EXPENSIVE_INPUT_PRICE_PER_MILLION
+)
+
+
+def _rates_for(model: str) -> Optional[Tuple[float, float, float]]:
+    """Per-token rates for a model, or None if it has no pricing."""
+    rates = _PRICE_TABLE.get(model)
+    if rates is None and model in MODEL_PRICING:
+        # Model registered in MODEL_PRICING after import
+        rates = _PRICE_TABLE[model] = _per_token_rates(MODEL_PRICING[model])
+    return rates
+
+
+@dataclass(slots=True)
 class UsageRecord:
     """Record of a single LLM API call."""
     request_id: str
@@ -73,6 +106,63 @@ class UsageRecord:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+# Record timestamps are stored as int64 microseconds since the epoch
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(timestamp: datetime) -> int:
+    """Microseconds since the epoch (naive datetimes stay naive)."""
+    epoch = _EPOCH if timestamp.tzinfo is None else _EPOCH_UTC
+    return (timestamp - epoch) // _MICROSECOND
+
+
+class _UsageColumns:
+    """
+    The numeric fields of the usage records, as parallel NumPy arrays
+    sorted by timestamp (struct-of-arrays).
+
+    The buffers double when full. A time window is found by binary
+    search on the timestamp column and aggregated with vectorized sums
+    over contiguous slices, without touching UsageRecord objects.
+    """
+
+    FIELDS = ("timestamp", "cost", "input_tokens", "output_tokens", "cached_tokens")
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.timestamp = np.empty(capacity, dtype=np.int64)
+        self.cost = np.empty(capacity, dtype=np.float64)
+        self.input_tokens = np.empty(capacity, dtype=np.int64)
+        self.output_tokens = np.empty(capacity, dtype=np.int64)
+        self.cached_tokens = np.empty(capacity, dtype=np.int64)
+
+    def add(self, record: UsageRecord) -> None:
+        if self.size == len(self.timestamp):
+            for name in self.FIELDS:
+                column = getattr(self, name)
+                setattr(self, name, np.concatenate((column, np.empty_like(column))))
+
+        row = (_to_micros(record.timestamp), record.cost_usd, record.input_tokens,
+               record.output_tokens, record.cached_tokens)
+        n = self.size
+        # Records usually arrive in time order; otherwise shift the tail
+        position = n
+        if n and row[0] < self.timestamp[n - 1]:
+            position = int(np.searchsorted(self.timestamp[:n], row[0], side="right"))
+        for name, value in zip(self.FIELDS, row):
+            column = getattr(self, name)
+            column[position + 1:n + 1] = column[position:n]
+            column[position] = value
+        self.size += 1
+
+    def since(self, cutoff: datetime) -> int:
+        """Index of the first row strictly after cutoff."""
+        return int(np.searchsorted(self.timestamp[:self.size], _to_micros(cutoff),
+                                   side="right"))
+
+
 class CostTracker:
     """
     Tracks and analyzes LLM token costs.
@@ -83,12 +173,17 @@ class CostTracker:
 
     def __init__(self):
         self._records: List[UsageRecord] = []
+
+        # Numeric fields again, as timestamp-sorted columns, so a time
+        # window is a binary search plus vectorized sums
+        self._columns = _UsageColumns()
         self._budgets: Dict[str, float] = {}  # team_id -> budget_usd
 
         # Aggregations for fast queries
         self._cost_by_team: Dict[str, float] = defaultdict(float)
         self._cost_by_model: Dict[str, float] = defaultdict(float)
         self._cost_by_workflow: Dict[str, float] = defaultdict(float)
+        self._cost_by_day: Dict[str, float] = defaultdict(float)  # "YYYY-MM-DD"
 
     def record_usage(self, record: UsageRecord) -> UsageRecord:
         """
@@ -97,27 +192,62 @@ class CostTracker:
         This should be called after every LLM invocation.
         """
         # Calculate cost
-        pricing = MODEL_PRICING.get(record.model)
-        if pricing:
-            input_cost = (record.input_tokens / 1_000_000) * pricing.input_price_per_million
-            output_cost = (record.output_tokens / 1_000_000) * pricing.output_price_per_million
-            cached_cost = (record.cached_tokens / 1_000_000) * pricing.cached_input_price_per_million
+        rates = _rates_for(record.model)
+        if rates:
+            input_rate, output_rate, cached_rate = rates
+            record.cost_usd = (record.input_tokens * input_rate
+                               + record.output_tokens * output_rate
+                               + record.cached_tokens * cached_rate)
+
+        self._store(record)
+        return record
 
-            record.cost_usd = input_cost + output_cost + cached_cost
+    def record_usage_batch(self, records: List[UsageRecord]) -> List[UsageRecord]:
+        """
+        Record many LLM API calls at once, e.g. a batch from a log shipper.
 
+        Same effect as calling record_usage() on each record in order, but
+        costs are computed per model as vectorized column arithmetic over
+        an (N, 3) token array, in the same order as record_usage() so the
+        results match bit for bit.
+        """
+        by_model: Dict[str, List[UsageRecord]] = defaultdict(list)
+        for record in records:
+            by_model[record.model].append(record)
+
+        for model, batch in by_model.items():
+            rates = _rates_for(model)
+            if not rates:
+                continue
+            input_rate, output_rate, cached_rate = rates
+            tokens = np.array(
+                [(r.input_tokens, r.output_tokens, r.cached_tokens) for r in batch],
+                dtype=np.float64)
+            costs = (tokens[:, 0] * input_rate
+                     + tokens[:, 1] * output_rate
+                     + tokens[:, 2] * cached_rate)
+            for record, cost in zip(batch, costs.tolist()):
+                record.cost_usd = cost
+
+        for record in records:
+            self._store(record)
+        return records
+
+    def _store(self, record: UsageRecord) -> None:
+        """Store a costed record, update aggregations and check budgets."""
         # Store record
         self._records.append(record)
+        self._columns.add(record)
 
         # Update aggregations
         self._cost_by_team[record.team_id] += record.cost_usd
         self._cost_by_model[record.model] += record.cost_usd
         self._cost_by_workflow[record.workflow_id] += record.cost_usd
+        self._cost_by_day[record.timestamp.strftime("%Y-%m-%d")] += record.cost_usd
 
         # Check budget alerts
         self._check_budget_alert(record)
 
-        return record
-
     def set_budget(self, team_id: str, budget_usd: float) -> None:
         """Set a monthly budget for a team."""
         self._budgets[team_id] = budget_usd
@@ -136,16 +266,17 @@ class CostTracker:
     def get_summary(self, time_window_hours: int = 24) -> Dict[str, Any]:
         """Get a summary of costs within a time window."""
         cutoff = datetime.now() - timedelta(hours=time_window_hours)
-        recent = [r for r in self._records if r.timestamp > cutoff]
+        columns = self._columns
+        start, end = columns.since(cutoff), columns.size
 
-        total_cost = sum(r.cost_usd for r in recent)
-        total_input = sum(r.input_tokens for r in recent)
-        total_output = sum(r.output_tokens for r in recent)
-        total_cached = sum(r.cached_tokens for r in recent)
+        total_cost = float(columns.cost[start:end].sum())
+        total_input = int(columns.input_tokens[start:end].sum())
+        total_output = int(columns.output_tokens[start:end].sum())
+        total_cached = int(columns.cached_tokens[start:end].sum())
 
         return {
             "time_window_hours": time_window_hours,
-            "request_count": len(recent),
+            "request_count": end - start,
             "total_cost_usd": round(total_cost, 4),
             "total_input_tokens": total_input,
             "total_output_tokens": total_output,
@@ -170,11 +301,7 @@ class CostTracker:
         elif group_by == "workflow":
             aggregation = self._cost_by_workflow
         else:
-            # Group by day
-            aggregation = defaultdict(float)
-            for r in self._records:
-                day_key = r.timestamp.strftime("%Y-%m-%d")
-                aggregation[day_key] += r.cost_usd
+            aggregation = self._cost_by_day
 
         total = sum(aggregation.values())
         return [
@@ -193,13 +320,50 @@ class AnomalyDetector:
 
     Key Principle: Set alerts for unusual patterns - a runaway loop
     can burn through thousands of dollars before anyone notices.
+
+    The window's mean and variance are kept up to date with Welford's
+    online algorithm (adding the new cost, removing the evicted one), so
+    each check is O(1) rather than two passes over the window.
+
+    The window never holds fewer than the 10 costs needed before checks
+    start, whatever window_size is.
     """
 
     def __init__(self, window_size: int = 100):
-        self._recent_costs: List[float] = []
+        self._recent_costs: deque[float] = deque(maxlen=max(window_size, 10))
         self.window_size = window_size
         self.alert_threshold_std = 3.0  # Alert if > 3 standard deviations
 
+        # Welford state for _recent_costs: mean and sum of squared deviations
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._evictions = 0  # since the last exact recompute
+
+    def _push(self, cost: float) -> None:
+        """Add a cost to the window, evicting the oldest when full."""
+        if len(self._recent_costs) == self._recent_costs.maxlen:
+            # Welford removal of the cost the append below evicts
+            oldest = self._recent_costs[0]
+            count = len(self._recent_costs) - 1
+            if count:
+                delta = oldest - self._mean
+                self._mean -= delta / count
+                self._m2 -= delta * (oldest - self._mean)
+            else:
+                self._mean = self._m2 = 0.0
+            self._evictions += 1
+
+        self._recent_costs.append(cost)
+        delta = cost - self._mean
+        self._mean += delta / len(self._recent_costs)
+        self._m2 += delta * (cost - self._mean)
+
+        # Removal accumulates rounding error; resync once per window
+        if self._evictions >= self._recent_costs.maxlen:
+            self._mean = sum(self._recent_costs) / len(self._recent_costs)
+            self._m2 = sum((x - self._mean) ** 2 for x in self._recent_costs)
+            self._evictions = 0
+
     def check(self, record: UsageRecord) -> Optional[Dict[str, Any]]:
         """
         Check if a request's cost is anomalous.
@@ -210,21 +374,19 @@ class AnomalyDetector:
 
         # Need enough history to detect anomalies
         if len(self._recent_costs) < 10:
-            self._recent_costs.append(cost)
+            self._push(cost)
             return None
 
         # Calculate statistics
-        mean = sum(self._recent_costs) / len(self._recent_costs)
-        variance = sum((x - mean) ** 2 for x in self._recent_costs) / len(self._recent_costs)
+        mean = self._mean
+        variance = max(self._m2, 0.0) / len(self._recent_costs)
         std = math.sqrt(variance) if variance > 0 else 0.01
 
         # Check for anomaly
         z_score = (cost - mean) / std if std > 0 else 0
 
         # Update history
-        self._recent_costs.append(cost)
-        if len(self._recent_costs) > self.window_size:
-            self._recent_costs.pop(0)
+        self._push(cost)
 
         if abs(z_score) > self.alert_threshold_std:
             return {
@@ -266,8 +428,7 @@ class OptimizationRecommender:
         # Check model selection
         model_costs = tracker.get_cost_breakdown(group_by="model")
         expensive_model_spend = sum(
-            m["cost_usd"] for m in model_costs
-            if "gpt-4o" in m["key"] or "sonnet" in m["key"]
+            m["cost_usd"] for m in model_costs if m["key"] in _EXPENSIVE_MODELS
         )
         total_spend = sum(m["cost_usd"] for m in model_costs)
 
@@ -329,10 +490,11 @@ if __name__ == "__main__":
         ("claude-3-5-haiku", 500, 200, 400, "customer-service", "chat"),
     ]
 
+    now = datetime.now()  # one clock read for the whole simulated batch
     for i, (model, input_t, output_t, cached_t, team, workflow) in enumerate(usage_data):
         record = UsageRecord(
             request_id=f"req-{i+1:03d}",
-            timestamp=datetime.now(),
+            timestamp=now,
             model=model,
             input_tokens=input_t,
             output_tokens=output_t,